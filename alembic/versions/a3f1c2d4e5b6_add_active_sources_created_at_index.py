@@ -0,0 +1,38 @@
+"""Add partial covering index on active sources by created_at
+
+Revision ID: a3f1c2d4e5b6
+Revises: 1f4da189227e
+Create Date: 2026-10-15 09:12:44.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f1c2d4e5b6'
+down_revision = '1f4da189227e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_sources_active_created_at',
+            'sources',
+            [sa.text('created_at DESC')],
+            unique=False,
+            postgresql_where=sa.text('active IS TRUE'),
+            postgresql_include=['obj_id', 'group_id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_sources_active_created_at',
+            table_name='sources',
+            postgresql_concurrently=True,
+        )
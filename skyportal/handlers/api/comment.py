@@ -1,9 +1,12 @@
 import string
 import base64
+import tornado.iostream
 from distutils.util import strtobool
 from marshmallow.exceptions import ValidationError
+from sqlalchemy.orm import defer
 from baselayer.app.access import permissions, auth_or_token
 from ..base import BaseHandler
+from ... import schema
 from ...models import (
     DBSession,
     Comment,
@@ -160,7 +163,7 @@ class CommentHandler(BaseHandler):
                 and 'name' in data['attachment']
             ):
                 attachment_bytes = str.encode(
-                    data['attachment']['body'].split('base64,')[-1]
+                    data['attachment']['body'].rpartition('base64,')[-1]
                 )
                 attachment_name = data['attachment']['name']
             else:
@@ -274,12 +277,12 @@ class CommentHandler(BaseHandler):
             associated_resource_type = 'object'
 
         if associated_resource_type.lower() == "object":  # comment on object
-            schema = Comment.__schema__()
+            comment_schema = schema.Comment
             c = Comment.get_if_accessible_by(
                 comment_id, self.current_user, mode="update", raise_if_none=True
             )
         elif associated_resource_type.lower() == "spectrum":
-            schema = CommentOnSpectrum.__schema__()
+            comment_schema = schema.CommentOnSpectrum
             c = CommentOnSpectrum.get_if_accessible_by(
                 comment_id, self.current_user, mode="update", raise_if_none=True
             )
@@ -295,12 +298,12 @@ class CommentHandler(BaseHandler):
         attachment_bytes = data.pop('attachment_bytes', None)
 
         try:
-            schema.load(data, partial=True)
+            comment_schema.load(data, partial=True)
         except ValidationError as e:
             return self.error(f'Invalid/missing parameters: {e.normalized_messages()}')
 
         if attachment_bytes is not None:
-            attachment_bytes = str.encode(attachment_bytes.split('base64,')[-1])
+            attachment_bytes = str.encode(attachment_bytes.rpartition('base64,')[-1])
             c.attachment_bytes = attachment_bytes
 
         bytes_is_none = c.attachment_bytes is None
@@ -367,11 +370,19 @@ class CommentHandler(BaseHandler):
 
         if associated_resource_type.lower() == "object":  # comment on object
             c = Comment.get_if_accessible_by(
-                comment_id, self.current_user, mode="delete", raise_if_none=True
+                comment_id,
+                self.current_user,
+                mode="delete",
+                raise_if_none=True,
+                options=[defer(Comment.attachment_bytes)],
             )
         elif associated_resource_type.lower() == "spectrum":
             c = CommentOnSpectrum.get_if_accessible_by(
-                comment_id, self.current_user, mode="delete", raise_if_none=True
+                comment_id,
+                self.current_user,
+                mode="delete",
+                raise_if_none=True,
+                options=[defer(CommentOnSpectrum.attachment_bytes)],
             )
         # add more options using elif
         else:
@@ -400,7 +411,7 @@ class CommentHandler(BaseHandler):
 
 class CommentAttachmentHandler(BaseHandler):
     @auth_or_token
-    def get(self, comment_id, associated_resource_type=None):
+    async def get(self, comment_id, associated_resource_type=None):
         """
         ---
         description: Download comment attachment
@@ -478,7 +489,18 @@ class CommentAttachmentHandler(BaseHandler):
                 "attachment; " f"filename={comment.attachment_name}",
             )
             self.set_header("Content-type", "application/octet-stream")
-            self.write(base64.b64decode(comment.attachment_bytes))
+
+            # send the decoded attachment in chunks rather than buffering
+            # a second copy of it in the response
+            attachment = memoryview(base64.b64decode(comment.attachment_bytes))
+            chunk_size = 1024 * 1024
+            for start in range(0, len(attachment), chunk_size):
+                try:
+                    self.write(bytes(attachment[start : start + chunk_size]))
+                    await self.flush()
+                except tornado.iostream.StreamClosedError:
+                    # the client has closed the connection
+                    break
         else:
             return self.success(
                 data={
@@ -19,16 +19,18 @@ _, cfg = load_env()
 
 
 def has_admin_access_for_group(user, group_id):
-    groupuser = (
-        GroupUser.query.filter(GroupUser.group_id == group_id)
+    if not {"System admin", "Manage groups", "Manage_users"}.isdisjoint(
+        user.permissions
+    ):
+        return True
+    is_group_admin = (
+        DBSession()
+        .query(GroupUser.admin)
+        .filter(GroupUser.group_id == group_id)
         .filter(GroupUser.user_id == user.id)
-        .first()
+        .scalar()
     )
-    return len(
-        {"System admin", "Manage groups", "Manage_users"}.intersection(
-            set(user.permissions)
-        )
-    ) > 0 or (groupuser is not None and groupuser.admin)
+    return bool(is_group_admin)
 
 
 class GroupHandler(BaseHandler):
@@ -200,7 +202,11 @@ class GroupHandler(BaseHandler):
             [g for g in self.current_user.accessible_groups if not g.single_user_group],
             key=lambda g: g.name.lower(),
         )
-        all_groups_query = Group.query_records_accessible_by(self.current_user)
+        # the full listing can be large; fetch plain column rows rather
+        # than hydrating a Group instance per row
+        all_groups_query = Group.query_records_accessible_by(
+            self.current_user, columns=list(Group.__table__.columns)
+        )
         if (not include_single_user_groups) or (
             isinstance(include_single_user_groups, str)
             and include_single_user_groups.lower() == "false"
@@ -209,7 +215,8 @@ class GroupHandler(BaseHandler):
                 Group.single_user_group.is_(False)
             )
         info["all_groups"] = sorted(
-            all_groups_query.all(), key=lambda g: g.name.lower()
+            (dict(row._mapping) for row in all_groups_query),
+            key=lambda g: g["name"].lower(),
         )
         self.verify_and_commit()
 
@@ -443,12 +450,14 @@ class GroupUserHandler(BaseHandler):
         )
 
         # Add user to group
-        gu = (
-            GroupUser.query.filter(GroupUser.group_id == group_id)
+        gu_id = (
+            DBSession()
+            .query(GroupUser.id)
+            .filter(GroupUser.group_id == group_id)
             .filter(GroupUser.user_id == user_id)
-            .first()
+            .scalar()
         )
-        if gu is not None:
+        if gu_id is not None:
             return self.error(
                 f"User {user_id} is already a member of group {group_id}."
             )
@@ -2,9 +2,18 @@ from baselayer.app.access import auth_or_token
 from ...base import BaseHandler
 from ....models import Source, DBSession
 
+import functools
 import subprocess
 
 
+@functools.lru_cache(maxsize=1)
+def get_postgres_version():
+    """Return the installed Postgres version, as reported by `psql`."""
+    p = subprocess.Popen(['psql', '--version'], stdout=subprocess.PIPE)
+    out, err = p.communicate()
+    return out.decode('utf-8').split()[2]
+
+
 class DBInfoHandler(BaseHandler):
     @auth_or_token
     def get(self):
@@ -30,11 +39,8 @@ class DBInfoHandler(BaseHandler):
                               type: string
                               description: Installed Postgres version
         """
-        p = subprocess.Popen(['psql', '--version'], stdout=subprocess.PIPE)
-        out, err = p.communicate()
-        postgres_version = out.decode('utf-8').split()[2]
         info = {
-            'source_table_empty': DBSession.query(Source).first() is None,
-            'postgres_version': postgres_version,
+            'source_table_empty': DBSession.query(Source.id).first() is None,
+            'postgres_version': get_postgres_version(),
         }
         return self.success(data=info)
@@ -36,7 +36,7 @@ class TokenHandler(BaseHandler):
 
         user = self.associated_user_object
         token_acls = set(data['acls'])
-        if not all([acl_id in user.permissions for acl_id in token_acls]):
+        if not token_acls.issubset(user.permissions):
             return self.error(
                 "User has attempted to grant token ACLs they do not have "
                 "access to. Please try again."
@@ -1,7 +1,12 @@
+import heapq
+
 from sqlalchemy import desc, or_
 from baselayer.app.access import auth_or_token
 from ..base import BaseHandler
 from ...models import (
+    DBSession,
+    Instrument,
+    User,
     Source,
     Comment,
     Classification,
@@ -52,8 +57,10 @@ class NewsFeedHandler(BaseHandler):
         else:
             n_items = 10
 
-        def fetch_newest(model, include_bot_comments=False):
-            query = model.query_records_accessible_by(self.current_user)
+        def fetch_newest(model, columns, include_bot_comments=False):
+            query = model.query_records_accessible_by(
+                self.current_user, columns=columns
+            )
             if model == Photometry:
                 query = query.filter(
                     or_(
@@ -68,112 +75,152 @@ class NewsFeedHandler(BaseHandler):
                 .distinct(model.obj_id, model.created_at)
                 .limit(n_items)
             )
-            newest = query.all()
+            return query.all()
 
-            if model == Comment:
-                for comment in newest:
-                    comment.author_info = comment.construct_author_info_dict()
+        def fetch_users(user_ids):
+            user_ids = set(user_ids)
+            if len(user_ids) == 0:
+                return {}
+            return {u.id: u for u in User.query.filter(User.id.in_(user_ids))}
 
-            return newest
+        def fetch_instrument_names(instrument_ids):
+            instrument_ids = set(instrument_ids)
+            if len(instrument_ids) == 0:
+                return {}
+            return dict(
+                DBSession()
+                .query(Instrument.id, Instrument.name)
+                .filter(Instrument.id.in_(instrument_ids))
+                .all()
+            )
 
-        news_feed_items = []
-        if preferences.get("newsFeed", {}).get("categories", {}).get("sources", True):
-            sources = fetch_newest(Source)
-            source_seen = set()
-            # Iterate in reverse so that we arrive at re-saved sources second
-            for s in reversed(sources):
-                if s.obj_id in source_seen:
-                    message = 'Source saved to new group'
-                else:
-                    message = 'New source saved'
-                    source_seen.add(s.obj_id)
+        categories = preferences.get("newsFeed", {}).get("categories", {})
 
-                # Prepend since we are iterating in reverse
-                news_feed_items.insert(
-                    0,
-                    {
-                        'type': 'source',
-                        'time': s.created_at,
-                        'message': message,
-                        'source_id': s.obj_id,
-                    },
-                )
-        if preferences.get("newsFeed", {}).get("categories", {}).get("comments", True):
-            include_bot_comments = (
-                preferences.get("newsFeed", {})
-                .get("categories", {})
-                .get("includeCommentsFromBots", False)
+        sources = comments = classifications = spectra = photometry = []
+        if categories.get("sources", True):
+            sources = fetch_newest(Source, [Source.obj_id, Source.created_at])
+        if categories.get("comments", True):
+            include_bot_comments = categories.get("includeCommentsFromBots", False)
+            comments = fetch_newest(
+                Comment,
+                [Comment.obj_id, Comment.created_at, Comment.text, Comment.author_id],
+                include_bot_comments,
             )
-            comments = fetch_newest(Comment, include_bot_comments)
-            # Add latest comments
-            news_feed_items.extend(
+        if categories.get("classifications", True):
+            classifications = fetch_newest(
+                Classification,
                 [
-                    {
-                        'type': 'comment',
-                        'time': c.created_at,
-                        'message': c.text,
-                        'source_id': c.obj_id,
-                        'author': c.author.username,
-                        'author_info': c.author_info,
-                    }
-                    for c in comments
-                ]
+                    Classification.obj_id,
+                    Classification.created_at,
+                    Classification.classification,
+                    Classification.author_id,
+                ],
             )
-        if (
-            preferences.get("newsFeed", {})
-            .get("categories", {})
-            .get("classifications", True)
-        ):
-            classifications = fetch_newest(Classification)
-            # Add latest classifications
-            news_feed_items.extend(
+        if categories.get("spectra", True):
+            spectra = fetch_newest(
+                Spectrum,
                 [
-                    {
-                        "type": "classification",
-                        "time": c.created_at,
-                        "message": f"New classification for {c.obj_id} added by {c.author.username}: {c.classification}",
-                        "source_id": c.obj_id,
-                        "author_info": basic_user_display_info(c.author),
-                    }
-                    for c in classifications
-                ]
+                    Spectrum.obj_id,
+                    Spectrum.created_at,
+                    Spectrum.owner_id,
+                    Spectrum.instrument_id,
+                ],
             )
-        if preferences.get("newsFeed", {}).get("categories", {}).get("spectra", True):
-            spectra = fetch_newest(Spectrum)
-            # Add latest spectra
-            news_feed_items.extend(
+        if categories.get("photometry", True):
+            photometry = fetch_newest(
+                Photometry,
                 [
-                    {
-                        "type": "spectrum",
-                        "time": s.created_at,
-                        "message": f"{s.owner.first_name} {s.owner.last_name} uploaded a new spectrum taken with {s.instrument.name} for {s.obj_id}",
-                        "source_id": s.obj_id,
-                        "author_info": basic_user_display_info(s.owner),
-                    }
-                    for s in spectra
-                ]
+                    Photometry.obj_id,
+                    Photometry.created_at,
+                    Photometry.owner_id,
+                    Photometry.instrument_id,
+                ],
             )
-        if (
-            preferences.get("newsFeed", {})
-            .get("categories", {})
-            .get("photometry", True)
-        ):
-            photometry = fetch_newest(Photometry)
-            # Add latest follow-up photometry
-            news_feed_items.extend(
-                [
-                    {
-                        "type": "photometry",
-                        "time": p.created_at,
-                        "message": f"{p.owner.first_name} {p.owner.last_name} uploaded new follow-up photometry taken with {p.instrument.name} for {p.obj_id}",
-                        "source_id": p.obj_id,
-                        "author_info": basic_user_display_info(p.owner),
-                    }
-                    for p in photometry
-                ]
+
+        # Resolve all authors/owners and instruments in one query each
+        users = fetch_users(
+            [c.author_id for c in comments + classifications]
+            + [x.owner_id for x in spectra + photometry]
+        )
+        instrument_names = fetch_instrument_names(
+            x.instrument_id for x in spectra + photometry
+        )
+
+        news_feed_items = []
+        source_seen = set()
+        # Iterate from oldest to newest so that we arrive at re-saved
+        # sources second; final ordering is handled below
+        for s in sorted(sources, key=lambda x: x.created_at):
+            if s.obj_id in source_seen:
+                message = 'Source saved to new group'
+            else:
+                message = 'New source saved'
+                source_seen.add(s.obj_id)
+
+            news_feed_items.append(
+                {
+                    'type': 'source',
+                    'time': s.created_at,
+                    'message': message,
+                    'source_id': s.obj_id,
+                }
             )
+        # Add latest comments
+        news_feed_items.extend(
+            [
+                {
+                    'type': 'comment',
+                    'time': c.created_at,
+                    'message': c.text,
+                    'source_id': c.obj_id,
+                    'author': users[c.author_id].username,
+                    'author_info': basic_user_display_info(users[c.author_id]),
+                }
+                for c in comments
+            ]
+        )
+        # Add latest classifications
+        news_feed_items.extend(
+            [
+                {
+                    "type": "classification",
+                    "time": c.created_at,
+                    "message": f"New classification for {c.obj_id} added by {users[c.author_id].username}: {c.classification}",
+                    "source_id": c.obj_id,
+                    "author_info": basic_user_display_info(users[c.author_id]),
+                }
+                for c in classifications
+            ]
+        )
+        # Add latest spectra
+        news_feed_items.extend(
+            [
+                {
+                    "type": "spectrum",
+                    "time": s.created_at,
+                    "message": f"{users[s.owner_id].first_name} {users[s.owner_id].last_name} uploaded a new spectrum taken with {instrument_names[s.instrument_id]} for {s.obj_id}",
+                    "source_id": s.obj_id,
+                    "author_info": basic_user_display_info(users[s.owner_id]),
+                }
+                for s in spectra
+            ]
+        )
+        # Add latest follow-up photometry
+        news_feed_items.extend(
+            [
+                {
+                    "type": "photometry",
+                    "time": p.created_at,
+                    "message": f"{users[p.owner_id].first_name} {users[p.owner_id].last_name} uploaded new follow-up photometry taken with {instrument_names[p.instrument_id]} for {p.obj_id}",
+                    "source_id": p.obj_id,
+                    "author_info": basic_user_display_info(users[p.owner_id]),
+                }
+                for p in photometry
+            ]
+        )
 
-        news_feed_items.sort(key=lambda x: x['time'], reverse=True)
-        news_feed_items = news_feed_items[:n_items]
+        news_feed_items = heapq.nlargest(
+            n_items, news_feed_items, key=lambda x: x['time']
+        )
         self.verify_and_commit()
         return self.success(data=news_feed_items)
@@ -2,15 +2,15 @@ import uuid
 import math
 import datetime
 import json
+from functools import lru_cache
 from io import StringIO
 
 from astropy.time import Time
-from astropy.table import Table
 from marshmallow.exceptions import ValidationError
+from numba import njit
 import numpy as np
 import pandas as pd
 import sncosmo
-from sncosmo.photdata import PhotometricData
 
 import sqlalchemy as sa
 from sqlalchemy.ext.compiler import compiles
@@ -82,13 +82,53 @@ def nan_to_none(value):
         return value
 
 
+def first_offending_packet(df, mask):
+    """Return the first row of `df` flagged by the boolean array `mask` as a
+    dict, with nans coerced to None, for use in validation error messages."""
+    row = df.iloc[[int(mask.argmax())]].astype(object)
+    return row.where(row.notna(), None).to_dict('records')[0]
+
+
 def allscalar(d):
     return all(np.isscalar(v) or v is None for v in d.values())
 
 
-def serialize(phot, outsys, format):
+@lru_cache(maxsize=None)
+def _relzp(magsys, filter):
+    """Return 2.5 log10 of the zeropoint bandflux of `filter` in the
+    magnitude system `magsys`. These are not actual zeropoints, but
+    differences between them give the corrections between systems."""
+    return 2.5 * np.log10(sncosmo.get_magsystem(magsys).zpbandflux(filter))
+
+
+@njit(cache=True)
+def _mag_to_flux(mag, magerr, limiting_mag, nsigma, magdet, zp):
+    """Convert magnitudes to fluxes and flux errors at zeropoint `zp`.
+    Detections take their flux error from the magnitude error; for
+    non-detections the flux is nan and the flux error is derived from
+    the `nsigma` limiting magnitude."""
+    flux = np.full(mag.size, np.nan)
+    fluxerr = np.empty(mag.size)
+    for i in range(mag.size):
+        if magdet[i]:
+            f = 10.0 ** (-0.4 * (mag[i] - zp))
+            flux[i] = f
+            fluxerr[i] = magerr[i] / (2.5 / np.log(10.0)) * f
+        else:
+            fluxerr[i] = 10.0 ** (-0.4 * (limiting_mag[i] - zp)) / nsigma[i]
+    return flux, fluxerr
+
 
-    return_value = {
+@lru_cache(maxsize=None)
+def _magsys_name(magsys):
+    """Return the canonical name of the magnitude system `magsys`."""
+    return sncosmo.get_magsystem(magsys).name
+
+
+def serialize_base(phot):
+    """Return the fields of a serialized photometry point that do not
+    depend on the output format or magnitude system."""
+    return {
         'obj_id': phot.obj_id,
         'ra': phot.ra,
         'dec': phot.dec,
@@ -104,18 +144,21 @@ def serialize(phot, outsys, format):
         'altdata': phot.altdata,
     }
 
-    filter = phot.filter
 
-    magsys_db = sncosmo.get_magsystem('ab')
-    outsys = sncosmo.get_magsystem(outsys)
+def serialize(phot, outsys, format):
+
+    return_value = serialize_base(phot)
+
+    filter = phot.filter
 
-    relzp_out = 2.5 * np.log10(outsys.zpbandflux(filter))
+    relzp_out = _relzp(outsys, filter)
+    outsys_name = _magsys_name(outsys)
 
     # note: these are not the actual zeropoints for magnitudes in the db or
     # packet, just ones that can be used to derive corrections when
     # compared to relzp_out
 
-    relzp_db = 2.5 * np.log10(magsys_db.zpbandflux(filter))
+    relzp_db = _relzp('ab', filter)
     db_correction = relzp_out - relzp_db
 
     # this is the zeropoint for fluxes in the database that is tied
@@ -127,8 +170,7 @@ def serialize(phot, outsys, format):
             phot.original_user_data is not None
             and 'limiting_mag' in phot.original_user_data
         ):
-            magsys_packet = sncosmo.get_magsystem(phot.original_user_data['magsys'])
-            relzp_packet = 2.5 * np.log10(magsys_packet.zpbandflux(filter))
+            relzp_packet = _relzp(phot.original_user_data['magsys'], filter)
             packet_correction = relzp_out - relzp_packet
             maglimit = phot.original_user_data['limiting_mag']
             maglimit_out = maglimit + packet_correction
@@ -144,7 +186,7 @@ def serialize(phot, outsys, format):
                 if nan_to_none(phot.mag) is not None
                 else None,
                 'magerr': phot.e_mag if nan_to_none(phot.e_mag) is not None else None,
-                'magsys': outsys.name,
+                'magsys': outsys_name,
                 'limiting_mag': maglimit_out,
             }
         )
@@ -152,7 +194,7 @@ def serialize(phot, outsys, format):
         return_value.update(
             {
                 'flux': nan_to_none(phot.flux),
-                'magsys': outsys.name,
+                'magsys': outsys_name,
                 'zp': corrected_db_zp,
                 'fluxerr': phot.fluxerr,
             }
@@ -165,6 +207,83 @@ def serialize(phot, outsys, format):
     return return_value
 
 
+def serialize_many(photometry, outsys, format):
+    """Serialize a sequence of photometry points, as `serialize` does for a
+    single point, but computing the magnitude system corrections and
+    derived quantities as vectorized operations over all points."""
+
+    if format not in ['flux', 'mag']:
+        raise ValueError(
+            'Invalid output format specified. Must be one of '
+            f"['flux', 'mag'], got '{format}'."
+        )
+
+    photometry = list(photometry)
+    if len(photometry) == 0:
+        return []
+
+    outsys_name = _magsys_name(outsys)
+
+    filters = np.array([phot.filter for phot in photometry])
+    unique_filters, filter_idx = np.unique(filters, return_inverse=True)
+    db_correction = np.array(
+        [_relzp(outsys, f) - _relzp('ab', f) for f in unique_filters]
+    )[filter_idx]
+
+    # this is the zeropoint for fluxes in the database that is tied
+    # to the new magnitude system
+    corrected_db_zp = PHOT_ZP + db_correction
+
+    flux = np.array([phot.flux for phot in photometry], dtype=float)
+    fluxerr = np.array([phot.fluxerr for phot in photometry], dtype=float)
+
+    output = [serialize_base(phot) for phot in photometry]
+
+    if format == 'mag':
+        # same check as Photometry.mag, so flux=+inf gives mag=-inf
+        detected = ~np.isnan(flux) & (flux > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mag = -2.5 * np.log10(flux) + PHOT_ZP + db_correction
+            magerr = (2.5 / np.log(10)) * (fluxerr / flux)
+            maglimit = -2.5 * np.log10(5 * fluxerr) + corrected_db_zp
+        has_magerr = detected & (fluxerr > 0)
+
+        for i, (phot, return_value) in enumerate(zip(photometry, output)):
+            if (
+                phot.original_user_data is not None
+                and 'limiting_mag' in phot.original_user_data
+            ):
+                packet_correction = _relzp(outsys, phot.filter) - _relzp(
+                    phot.original_user_data['magsys'], phot.filter
+                )
+                maglimit_out = (
+                    phot.original_user_data['limiting_mag'] + packet_correction
+                )
+            else:
+                maglimit_out = maglimit[i]
+
+            return_value.update(
+                {
+                    'mag': mag[i] if detected[i] else None,
+                    'magerr': magerr[i] if has_magerr[i] else None,
+                    'magsys': outsys_name,
+                    'limiting_mag': maglimit_out,
+                }
+            )
+    else:
+        for i, return_value in enumerate(output):
+            return_value.update(
+                {
+                    'flux': flux[i] if not np.isnan(flux[i]) else None,
+                    'magsys': outsys_name,
+                    'zp': corrected_db_zp[i],
+                    'fluxerr': fluxerr[i],
+                }
+            )
+
+    return output
+
+
 class PhotometryHandler(BaseHandler):
     def standardize_photometry_data(self):
 
@@ -249,17 +368,10 @@ class PhotometryHandler(BaseHandler):
             #  if A and not B or B and not A
 
             # coerce to numpy array
-            bad = bad.values
-
-            if any(bad):
-                # find the first offending packet
-                first_offender = np.argwhere(bad)[0, 0]
-                packet = df.iloc[first_offender].to_dict()
+            bad = bad.to_numpy()
 
-                # coerce nans to nones
-                for key in packet:
-                    if key != 'standardized_flux':
-                        packet[key] = nan_to_none(packet[key])
+            if bad.any():
+                packet = first_offending_packet(df, bad)
 
                 raise ValidationError(
                     f'Error parsing packet "{packet}": mag '
@@ -269,13 +381,8 @@ class PhotometryHandler(BaseHandler):
 
             for field in ['mag', 'magerr', 'limiting_mag']:
                 infinite = np.isinf(df[field].values)
-                if any(infinite):
-                    first_offender = np.argwhere(infinite)[0, 0]
-                    packet = df.iloc[first_offender].to_dict()
-
-                    # coerce nans to nones
-                    for key in packet:
-                        packet[key] = nan_to_none(packet[key])
+                if infinite.any():
+                    packet = first_offending_packet(df, infinite)
 
                     raise ValidationError(
                         f'Error parsing packet "{packet}": '
@@ -284,14 +391,9 @@ class PhotometryHandler(BaseHandler):
 
             # ensure nothing is null for the required fields
             for field in PhotMagFlexible.required_keys:
-                missing = df[field].isna()
-                if any(missing):
-                    first_offender = np.argwhere(missing)[0, 0]
-                    packet = df.iloc[first_offender].to_dict()
-
-                    # coerce nans to nones
-                    for key in packet:
-                        packet[key] = nan_to_none(packet[key])
+                missing = df[field].isna().to_numpy()
+                if missing.any():
+                    packet = first_offending_packet(df, missing)
 
                     raise ValidationError(
                         f'Error parsing packet "{packet}": '
@@ -299,33 +401,22 @@ class PhotometryHandler(BaseHandler):
                     )
 
             # convert the mags to fluxes
-            # detections
-            detflux = 10 ** (-0.4 * (df[magdet]['mag'] - PHOT_ZP))
-            detfluxerr = df[magdet]['magerr'] / (2.5 / np.log(10)) * detflux
-
-            # non-detections
-            limmag_flux = 10 ** (-0.4 * (df[magnull]['limiting_mag'] - PHOT_ZP))
-            ndetfluxerr = limmag_flux / df[magnull]['limiting_mag_nsigma']
-
-            # initialize flux to be none
-            phot_table = Table.from_pandas(df[['mjd', 'magsys', 'filter']])
+            flux, fluxerr = _mag_to_flux(
+                df['mag'].to_numpy(dtype=float),
+                df['magerr'].to_numpy(dtype=float),
+                df['limiting_mag'].to_numpy(dtype=float),
+                df['limiting_mag_nsigma'].to_numpy(dtype=float),
+                magdet.to_numpy(),
+                float(PHOT_ZP),
+            )
 
-            phot_table['zp'] = PHOT_ZP
-            phot_table['flux'] = np.nan
-            phot_table['fluxerr'] = np.nan
-            phot_table['flux'][magdet] = detflux
-            phot_table['fluxerr'][magdet] = detfluxerr
-            phot_table['fluxerr'][magnull] = ndetfluxerr
+            zp = np.full(len(df), PHOT_ZP)
 
         else:
             for field in PhotFluxFlexible.required_keys:
-                missing = df[field].isna().values
-                if any(missing):
-                    first_offender = np.argwhere(missing)[0, 0]
-                    packet = df.iloc[first_offender].to_dict()
-
-                    for key in packet:
-                        packet[key] = nan_to_none(packet[key])
+                missing = df[field].isna().to_numpy()
+                if missing.any():
+                    packet = first_offending_packet(df, missing)
 
                     raise ValidationError(
                         f'Error parsing packet "{packet}": '
@@ -334,40 +425,45 @@ class PhotometryHandler(BaseHandler):
 
             for field in ['flux', 'fluxerr']:
                 infinite = np.isinf(df[field].values)
-                if any(infinite):
-                    first_offender = np.argwhere(infinite)[0, 0]
-                    packet = df.iloc[first_offender].to_dict()
-
-                    # coerce nans to nones
-                    for key in packet:
-                        packet[key] = nan_to_none(packet[key])
+                if infinite.any():
+                    packet = first_offending_packet(df, infinite)
 
                     raise ValidationError(
                         f'Error parsing packet "{packet}": '
                         f'field {field} must be finite.'
                     )
 
-            phot_table = Table.from_pandas(df[['mjd', 'magsys', 'filter', 'zp']])
-            phot_table['flux'] = df['flux'].fillna(np.nan)
-            phot_table['fluxerr'] = df['fluxerr'].fillna(np.nan)
-
-        # convert to microjanskies, AB for DB storage as a vectorized operation
-        pdata = PhotometricData(phot_table)
-        standardized = pdata.normalized(zp=PHOT_ZP, zpsys='ab')
+            flux = df['flux'].to_numpy(dtype=float)
+            fluxerr = df['fluxerr'].to_numpy(dtype=float)
+            zp = df['zp'].to_numpy(dtype=float)
+
+        # convert to microjanskies, AB for DB storage as a vectorized operation:
+        # rescale each packet from its zeropoint to PHOT_ZP, then correct from
+        # its magnitude system to AB once per unique (magsys, filter) pair
+        norm_factor = 10 ** (0.4 * (PHOT_ZP - zp))
+        for (magsys, filter), idx in df.groupby(['magsys', 'filter']).indices.items():
+            norm_factor[idx] *= 10 ** (
+                0.4 * (_relzp(magsys, filter) - _relzp('ab', filter))
+            )
 
-        df['standardized_flux'] = standardized.flux
-        df['standardized_fluxerr'] = standardized.fluxerr
+        df['standardized_flux'] = flux * norm_factor
+        df['standardized_fluxerr'] = fluxerr * norm_factor
 
-        instrument_cache = {}
-        for iid in df['instrument_id'].unique():
-            instrument = Instrument.query.get(int(iid))
-            if not instrument:
+        instrument_ids = [int(iid) for iid in df['instrument_id'].unique()]
+        instrument_cache = {
+            instrument.id: instrument
+            for instrument in Instrument.query.filter(Instrument.id.in_(instrument_ids))
+        }
+        for iid in instrument_ids:
+            if iid not in instrument_cache:
                 raise ValidationError(f'Invalid instrument ID: {iid}')
-            instrument_cache[iid] = instrument
 
-        for oid in df['obj_id'].unique():
-            obj = Obj.query.get(oid)
-            if not obj:
+        obj_ids = df['obj_id'].unique().tolist()
+        existing_obj_ids = {
+            oid for oid, in DBSession().query(Obj.id).filter(Obj.id.in_(obj_ids))
+        }
+        for oid in obj_ids:
+            if oid not in existing_obj_ids:
                 raise ValidationError(f'Invalid object ID: {oid}')
 
         return df, instrument_cache
@@ -531,35 +627,42 @@ class PhotometryHandler(BaseHandler):
         df = df.where(pd.notnull(df), None)
         df.loc[df['standardized_flux'].isna(), 'standardized_flux'] = np.nan
 
-        rows = df.to_dict('records')
+        # pull each column out once as a plain list rather than
+        # materializing a dict per row
+        columns = {column: df[column].tolist() for column in df.columns}
         upload_id = str(uuid.uuid4())
 
-        params = []
-        group_photometry_params = []
-        stream_photometry_params = []
-        for packet in rows:
-            if (
-                packet["filter"]
-                not in instrument_cache[packet['instrument_id']].filters
-            ):
-                instrument = instrument_cache[packet['instrument_id']]
+        # validate filters once per unique (instrument, filter) pair
+        for instrument_id, filter in (
+            df[['instrument_id', 'filter']].drop_duplicates().itertuples(index=False)
+        ):
+            instrument = instrument_cache[instrument_id]
+            if filter not in instrument.filters:
                 raise ValidationError(
-                    f"Instrument {instrument.name} has no filter "
-                    f"{packet['filter']}."
+                    f"Instrument {instrument.name} has no filter {filter}."
                 )
 
-            flux = packet.pop('standardized_flux')
-            fluxerr = packet.pop('standardized_fluxerr')
+        utcnow = datetime.datetime.utcnow().isoformat()
+        owner_id = self.associated_user_object.id
 
-            # reduce the DB size by ~2x
-            keys = ['limiting_mag', 'magsys', 'limiting_mag_nsigma']
-            original_user_data = {key: packet[key] for key in keys if key in packet}
+        # reduce the DB size by ~2x
+        keys = [
+            key
+            for key in ['limiting_mag', 'magsys', 'limiting_mag_nsigma']
+            if key in columns
+        ]
+
+        params = []
+        for i in range(len(df)):
+            flux = columns['standardized_flux'][i]
+            fluxerr = columns['standardized_fluxerr'][i]
+
+            original_user_data = {key: columns[key][i] for key in keys}
             if original_user_data == {}:
                 original_user_data = None
 
-            utcnow = datetime.datetime.utcnow().isoformat()
             phot = dict(
-                id=packet['id'],
+                id=columns['id'][i],
                 original_user_data=json.dumps(original_user_data),
                 upload_id=upload_id,
                 # The psycopg copy_to function cannot automatically
@@ -567,42 +670,43 @@ class PhotometryHandler(BaseHandler):
                 # the NaN value manually here.
                 flux="NaN" if np.isnan(flux) else flux,
                 fluxerr=fluxerr,
-                obj_id=packet['obj_id'],
-                altdata=json.dumps(packet['altdata']),
-                instrument_id=packet['instrument_id'],
-                ra_unc=packet['ra_unc'],
-                dec_unc=packet['dec_unc'],
-                mjd=packet['mjd'],
-                filter=packet['filter'],
-                ra=packet['ra'],
-                dec=packet['dec'],
-                origin=packet["origin"],
-                owner_id=self.associated_user_object.id,
+                obj_id=columns['obj_id'][i],
+                altdata=json.dumps(columns['altdata'][i]),
+                instrument_id=columns['instrument_id'][i],
+                ra_unc=columns['ra_unc'][i],
+                dec_unc=columns['dec_unc'][i],
+                mjd=columns['mjd'][i],
+                filter=columns['filter'][i],
+                ra=columns['ra'][i],
+                dec=columns['dec'][i],
+                origin=columns['origin'][i],
+                owner_id=owner_id,
                 created_at=utcnow,
                 modified=utcnow,
             )
 
             params.append(phot)
 
-            for group_id in group_ids:
-                group_photometry_params.append(
-                    {
-                        'photometr_id': packet['id'],
-                        'group_id': group_id,
-                        'created_at': utcnow,
-                        'modified': utcnow,
-                    }
-                )
-
-            for stream_id in stream_ids:
-                stream_photometry_params.append(
-                    {
-                        'photometr_id': packet['id'],
-                        'stream_id': stream_id,
-                        'created_at': utcnow,
-                        'modified': utcnow,
-                    }
-                )
+        group_photometry_params = [
+            {
+                'photometr_id': photometry_id,
+                'group_id': group_id,
+                'created_at': utcnow,
+                'modified': utcnow,
+            }
+            for photometry_id in ids
+            for group_id in group_ids
+        ]
+        stream_photometry_params = [
+            {
+                'photometr_id': photometry_id,
+                'stream_id': stream_id,
+                'created_at': utcnow,
+                'modified': utcnow,
+            }
+            for photometry_id in ids
+            for stream_id in stream_ids
+        ]
 
         if len(params) > 0:
             save_data_using_copy(
@@ -903,14 +1007,13 @@ class PhotometryHandler(BaseHandler):
             except ValidationError as e:
                 return self.error(e.args[0])
 
-            for (df_index, _), id in zip(new_photometry.iterrows(), ids):
-                id_map[df_index] = id
+            id_map.update(zip(new_photometry.index, ids))
 
         # release the lock
         self.verify_and_commit()
 
         # get ids in the correct order
-        ids = [id_map[pdidx] for pdidx, _ in df.iterrows()]
+        ids = [id_map[pdidx] for pdidx in df.index]
         return self.success(data={'ids': ids})
 
     @auth_or_token
@@ -997,9 +1100,8 @@ class PhotometryHandler(BaseHandler):
                 return self.error(
                     "Invalid group_ids field. Specify at least one valid group ID."
                 )
-            if not all(
-                [group in self.current_user.accessible_groups for group in groups]
-            ):
+            accessible_group_ids = {g.id for g in self.current_user.accessible_groups}
+            if not all(group.id in accessible_group_ids for group in groups):
                 return self.error(
                     "Cannot upload photometry to groups you are not a member of."
                 )
@@ -1011,16 +1113,17 @@ class PhotometryHandler(BaseHandler):
                 stream_ids, self.current_user, raise_if_none=True
             )
             # Add new stream_photometry rows if not already present
+            existing_stream_ids = {
+                stream_id
+                for stream_id, in StreamPhotometry.query_records_accessible_by(
+                    self.current_user, columns=[StreamPhotometry.stream_id]
+                ).filter(
+                    StreamPhotometry.stream_id.in_([stream.id for stream in streams]),
+                    StreamPhotometry.photometr_id == photometry_id,
+                )
+            }
             for stream in streams:
-                if (
-                    StreamPhotometry.query_records_accessible_by(self.current_user)
-                    .filter(
-                        StreamPhotometry.stream_id == stream.id,
-                        StreamPhotometry.photometr_id == photometry_id,
-                    )
-                    .first()
-                    is None
-                ):
+                if stream.id not in existing_stream_ids:
                     DBSession().add(
                         StreamPhotometry(
                             photometr_id=photometry_id, stream_id=stream.id
@@ -1073,9 +1176,7 @@ class ObjPhotometryHandler(BaseHandler):
         format = self.get_query_argument('format', 'mag')
         outsys = self.get_query_argument('magsys', 'ab')
         self.verify_and_commit()
-        return self.success(
-            data=[serialize(phot, outsys, format) for phot in photometry]
-        )
+        return self.success(data=serialize_many(photometry, outsys, format))
 
 
 class BulkDeletePhotometryHandler(BaseHandler):
@@ -1166,7 +1267,7 @@ class PhotometryRangeHandler(BaseHandler):
             group_phot_subquery, Photometry.id == group_phot_subquery.c.photometr_id
         )
 
-        output = [serialize(p, magsys, format) for p in query]
+        output = serialize_many(query, magsys, format)
         self.verify_and_commit()
         return self.success(data=output)
 
@@ -8,7 +8,7 @@ from tornado.ioloop import IOLoop
 import io
 import math
 from dateutil.parser import isoparse
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import defer, joinedload, selectinload
 from sqlalchemy import func, or_, distinct
 import arrow
 from marshmallow import Schema, fields
@@ -111,15 +111,16 @@ class SourceHandler(BaseHandler):
                   schema: Error
         """
         user_group_ids = [g.id for g in self.associated_user_object.accessible_groups]
-        num_s = (
+        source_exists = (
             DBSession()
-            .query(Source)
+            .query(Source.id)
             .filter(Source.obj_id == obj_id)
             .filter(Source.group_id.in_(user_group_ids))
-            .count()
+            .first()
+            is not None
         )
         self.verify_and_commit()
-        if num_s > 0:
+        if source_exists:
             return self.success()
         else:
             self.set_status(404)
@@ -695,7 +696,8 @@ class SourceHandler(BaseHandler):
                         self.current_user,
                         options=[
                             joinedload(Comment.author),
-                            joinedload(Comment.groups),
+                            selectinload(Comment.groups),
+                            defer(Comment.attachment_bytes),
                         ],
                     )
                     .filter(Comment.obj_id == obj_id)
@@ -823,7 +825,7 @@ class SourceHandler(BaseHandler):
 
         # Fetch multiple sources
         obj_query_options = (
-            [joinedload(Obj.thumbnails)]
+            [selectinload(Obj.thumbnails)]
             if include_thumbnails and not remove_nested
             else []
         )
@@ -1166,7 +1168,8 @@ class SourceHandler(BaseHandler):
                                 if k != "attachment_bytes"
                             }
                             for c in Comment.query_records_accessible_by(
-                                self.current_user
+                                self.current_user,
+                                options=[defer(Comment.attachment_bytes)],
                             )
                             .filter(Comment.obj_id == obj.id)
                             .all()
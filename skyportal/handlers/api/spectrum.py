@@ -3,7 +3,7 @@ from pathlib import Path
 from astropy.time import Time
 import numpy as np
 
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import defer, joinedload
 
 from marshmallow.exceptions import ValidationError
 from baselayer.app.access import permissions, auth_or_token
@@ -538,7 +538,10 @@ class ObjSpectraHandler(BaseHandler):
             comments = (
                 CommentOnSpectrum.query_records_accessible_by(
                     self.current_user,
-                    options=[joinedload(CommentOnSpectrum.groups)],
+                    options=[
+                        joinedload(CommentOnSpectrum.groups),
+                        defer(CommentOnSpectrum.attachment_bytes),
+                    ],
                 )
                 .filter(CommentOnSpectrum.spectrum_id == spec.id)
                 .all()
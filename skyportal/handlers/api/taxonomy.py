@@ -1,10 +1,15 @@
-from tdtax import schema, validate
+from tdtax import schema
 from jsonschema.exceptions import ValidationError as JSONValidationError
+from jsonschema.validators import validator_for
 
 from baselayer.app.access import permissions, auth_or_token
 from ..base import BaseHandler
 from ...models import DBSession, Taxonomy, Group
 
+# jsonschema.validate re-checks the schema and builds a new validator on
+# every call; the tdtax schema is fixed, so do that once at import
+tdtax_validator = validator_for(schema)(schema)
+
 
 class TaxonomyHandler(BaseHandler):
     @auth_or_token
@@ -140,12 +145,16 @@ class TaxonomyHandler(BaseHandler):
         if version is None:
             return self.error("A version string must be provided for a taxonomy")
 
-        existing_matches = (
-            Taxonomy.query.filter(Taxonomy.name == name)
-            .filter(Taxonomy.version == version)
-            .all()
+        version_exists = (
+            DBSession()
+            .query(
+                Taxonomy.query.filter(Taxonomy.name == name)
+                .filter(Taxonomy.version == version)
+                .exists()
+            )
+            .scalar()
         )
-        if len(existing_matches) != 0:
+        if version_exists:
             return self.error(
                 "That version/name combination is already "
                 "present. If you really want to replace this "
@@ -158,13 +167,13 @@ class TaxonomyHandler(BaseHandler):
             return self.error("A JSON of the taxonomy must be given")
 
         try:
-            validate(hierarchy, schema)
+            tdtax_validator.validate(hierarchy)
         except JSONValidationError:
             return self.error("Hierarchy does not validate against the schema.")
 
         # establish the groups to use
         user_group_ids = [g.id for g in self.current_user.groups]
-        user_accessible_group_ids = [g.id for g in self.current_user.accessible_groups]
+        user_accessible_group_ids = {g.id for g in self.current_user.accessible_groups}
         group_ids = data.pop("group_ids", user_group_ids)
         if group_ids == []:
             group_ids = user_group_ids
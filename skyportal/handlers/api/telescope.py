@@ -2,6 +2,7 @@ from marshmallow.exceptions import ValidationError
 from baselayer.app.access import permissions, auth_or_token
 
 from ..base import BaseHandler
+from ... import schema
 from ...models import DBSession, Telescope
 
 
@@ -38,10 +39,9 @@ class TelescopeHandler(BaseHandler):
                 schema: Error
         """
         data = self.get_json()
-        schema = Telescope.__schema__()
 
         try:
-            telescope = schema.load(data)
+            telescope = schema.Telescope.load(data)
         except ValidationError as e:
             return self.error(
                 'Invalid/missing parameters: ' f'{e.normalized_messages()}'
@@ -135,15 +135,15 @@ class TelescopeHandler(BaseHandler):
               application/json:
                 schema: Error
         """
-        t = Telescope.query.get(int(telescope_id))
+        telescope_id = int(telescope_id)
+        t = Telescope.query.get(telescope_id)
         if t is None:
             return self.error('Invalid telescope ID.')
         data = self.get_json()
-        data['id'] = int(telescope_id)
+        data['id'] = telescope_id
 
-        schema = Telescope.__schema__()
         try:
-            schema.load(data)
+            schema.Telescope.load(data)
         except ValidationError as e:
             return self.error(
                 'Invalid/missing parameters: ' f'{e.normalized_messages()}'
@@ -175,11 +175,14 @@ class TelescopeHandler(BaseHandler):
               application/json:
                 schema: Error
         """
-        t = Telescope.query.get(int(telescope_id))
-        if t is None:
+        n_deleted = (
+            DBSession()
+            .query(Telescope)
+            .filter(Telescope.id == int(telescope_id))
+            .delete()
+        )
+        if n_deleted == 0:
             return self.error('Invalid telescope ID.')
-
-        DBSession().query(Telescope).filter(Telescope.id == int(telescope_id)).delete()
         self.verify_and_commit()
 
         return self.success()
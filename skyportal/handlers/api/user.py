@@ -2,6 +2,7 @@ import phonenumbers
 from phonenumbers.phonenumberutil import NumberParseException
 from validate_email import validate_email
 import arrow
+from sqlalchemy.orm import selectinload
 
 from ..base import BaseHandler
 from baselayer.app.access import permissions, auth_or_token
@@ -239,6 +240,20 @@ class UserHandler(BaseHandler):
         total_matches = query.count()
         if n_per_page is not None:
             query = query.limit(n_per_page).offset((page_number - 1) * n_per_page)
+
+        # Only Sys admins can see other users' group memberships
+        is_system_admin = self.current_user.is_system_admin
+
+        # load the per-user collections read below in one IN query each,
+        # rather than lazily for every user on the page
+        load_options = [
+            selectinload(User.roles).selectinload(Role.acls),
+            selectinload(User.acls),
+        ]
+        if is_system_admin:
+            load_options += [selectinload(User.groups), selectinload(User.streams)]
+        query = query.options(*load_options)
+
         info = {}
         return_values = []
         for user in query.all():
@@ -249,8 +264,7 @@ class UserHandler(BaseHandler):
             if user.contact_phone:
                 return_values[-1]["contact_phone"] = user.contact_phone.e164
             return_values[-1]["contact_email"] = user.contact_email
-            # Only Sys admins can see other users' group memberships
-            if self.current_user.is_system_admin:
+            if is_system_admin:
                 return_values[-1]["groups"] = user.groups
                 return_values[-1]["streams"] = user.streams
 
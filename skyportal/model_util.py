@@ -121,11 +121,12 @@ def setup_permissions():
     If a given ACL or Role already exists, it will be skipped."""
     all_acls = [ACL.create_or_get(a) for a in all_acl_ids]
     DBSession().add_all(all_acls)
-    DBSession().commit()
+    DBSession().flush()
+    acl_by_id = {acl.id: acl for acl in all_acls}
 
     for r, acl_ids in role_acls.items():
         role = Role.create_or_get(r)
-        role.acls = [ACL.query.get(a) for a in acl_ids]
+        role.acls = [acl_by_id[a] for a in acl_ids]
         DBSession().add(role)
     DBSession().commit()
 
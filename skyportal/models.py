@@ -1415,6 +1415,16 @@ Source.unsaved_at = sa.Column(
     doc="ISO UTC time when the Obj was unsaved from Group.",
 )
 
+# Partial covering index for the "most recently saved active sources"
+# queries (recent sources widget, news feed), allowing an index-only
+# backwards scan bounded by the query limit rather than a full sort.
+sa.Index(
+    'ix_sources_active_created_at',
+    Source.created_at.desc(),
+    postgresql_where=Source.active.is_(True),
+    postgresql_include=['obj_id', 'group_id'],
+)
+
 Obj.sources = relationship(
     Source,
     back_populates='obj',
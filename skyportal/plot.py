@@ -432,10 +432,12 @@ def photometry_plot(obj_id, user, width=600, device="browser"):
     color_dict = {'field': 'filter', 'transform': color_mapper}
 
     labels = []
-    for i, datarow in data.iterrows():
-        label = f'{datarow["instrument"]}/{datarow["filter"]}'
-        if datarow['origin'] is not None:
-            label += f'/{datarow["origin"]}'
+    for instrument, filt, origin in zip(
+        data['instrument'], data['filter'], data['origin']
+    ):
+        label = f'{instrument}/{filt}'
+        if origin is not None:
+            label += f'/{origin}'
         labels.append(label)
 
     data['label'] = labels
@@ -609,11 +611,7 @@ def photometry_plot(obj_id, user, width=600, device="browser"):
         y_err_x = []
         y_err_y = []
 
-        for d, ro in df.iterrows():
-            px = ro['mjd']
-            py = ro['flux']
-            err = ro['fluxerr']
-
+        for px, py, err in zip(df['mjd'], df['flux'], df['fluxerr']):
             y_err_x.append((px, px))
             y_err_y.append((py - err, py + err))
 
@@ -875,11 +873,8 @@ def photometry_plot(obj_id, user, width=600, device="browser"):
         y_err_x = []
         y_err_y = []
 
-        for d, ro in df[df['obs']].iterrows():
-            px = ro['mjd']
-            py = ro['mag']
-            err = ro['magerr']
-
+        obs = df[df['obs']]
+        for px, py, err in zip(obs['mjd'], obs['mag'], obs['magerr']):
             y_err_x.append((px, px))
             y_err_y.append((py - err, py + err))
 
@@ -1101,10 +1096,8 @@ def photometry_plot(obj_id, user, width=600, device="browser"):
                 y_err_y = []
 
                 # get each visible error value
-                for d, ro in df[df['obs']].iterrows():
-                    px = ro['mjd_fold' + ph]
-                    py = ro['mag']
-                    err = ro['magerr']
+                obs = df[df['obs']]
+                for px, py, err in zip(obs['mjd_fold' + ph], obs['mag'], obs['magerr']):
                     # set up error tuples
                     y_err_x.append((px, px))
                     y_err_y.append((py - err, py + err))
@@ -1,4 +1,5 @@
 import glob
+import http.cookiejar
 import json
 import datetime
 import re
@@ -14,6 +15,16 @@ import requests
 from baselayer.app.env import load_env
 from baselayer.log import make_log
 
+cache_file_date_regex = re.compile(r"\d+-\d+-\d+")
+cache_file = {"path": None, "expires": datetime.date.min}
+
+# One session for all forwarded calls, for consistency only: each call runs
+# inside its own use_cassette() block, which closes the pooled connections
+# on exit, so nothing is kept alive between calls. Cookies are rejected so
+# that one (independent) forwarded call does not carry state to the next
+session = requests.Session()
+session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
 
 def get_cache_file_static():
     """
@@ -35,26 +46,45 @@ def get_cache_file():
     """
     Helper function to get the path to the VCR cache file.
     The function will also delete the existing cache if it is too old.
+    The path is memoized until the cache is due to be refreshed, so that
+    the cache directory is not globbed on every request.
     """
-    files = glob.glob("cache/test_server_recordings_*.yaml")
     today = datetime.date.today()
+    if today < cache_file["expires"]:
+        return cache_file["path"]
+
+    files = glob.glob("cache/test_server_recordings_*.yaml")
 
     # If no cache files, just return a fresh one stamped for today
     if len(files) == 0:
-        return f"cache/test_server_recordings_{today.isoformat()}.yaml"
+        return memoize_cache_file(
+            f"cache/test_server_recordings_{today.isoformat()}.yaml", today
+        )
 
     current_file = files[0]
     current_file_date = datetime.date.fromisoformat(
-        re.findall(r"\d+-\d+-\d+", current_file)[0]
+        cache_file_date_regex.search(current_file).group(0)
     )
     # Cache should be refreshed
     if (today - current_file_date).days > refresh_cache_days:
         # Delete old cache and return new file path
         os.remove(current_file)
-        return f"cache/test_server_recordings_{today.isoformat()}.yaml"
+        return memoize_cache_file(
+            f"cache/test_server_recordings_{today.isoformat()}.yaml", today
+        )
 
     # Cache is still valid
-    return current_file
+    return memoize_cache_file(current_file, current_file_date)
+
+
+def memoize_cache_file(path, file_date):
+    """
+    Remember the cache file path until the first day on which
+    get_cache_file would consider it stale.
+    """
+    cache_file["path"] = path
+    cache_file["expires"] = file_date + datetime.timedelta(days=refresh_cache_days + 1)
+    return path
 
 
 def lt_request_matcher(r1, r2):
@@ -191,14 +221,7 @@ class TestRouteHandler(tornado.web.RequestHandler):
                     log(f"Forwarding DELETE call {url}")
 
                 # Convert Tornado HTTPHeaders object to a regular dict
-                headers = {}
-                for k, v in self.request.headers.get_all():
-                    headers[k] = v
-
-                # Convert Tornado HTTPHeaders object to a regular dict
-                headers = {}
-                for k, v in self.request.headers.get_all():
-                    headers[k] = v
+                headers = dict(self.request.headers)
 
                 if "/api/requestgroups/" in self.request.uri:
                     header = {'Authorization': headers['Authorization']}
@@ -207,19 +230,18 @@ class TestRouteHandler(tornado.web.RequestHandler):
                         if len(self.request.body) > 0
                         else None
                     )
-                    requests.delete(
+                    session.delete(
                         url,
                         json=json_body,
                         headers=header,
                     )
                 else:
                     log(f"Forwarding DELETE call: {url}")
-                    s = requests.Session()
                     req = requests.Request(
                         'DELETE', url, data=self.request.body, headers=headers
                     )
                     prepped = req.prepare()
-                    s.send(prepped)
+                    session.send(prepped)
 
                 # Get recorded document and pass it back
                 response = cass.responses_of(
@@ -274,14 +296,7 @@ class TestRouteHandler(tornado.web.RequestHandler):
                     log(f"Forwarding PUT call {url}")
 
                 # Convert Tornado HTTPHeaders object to a regular dict
-                headers = {}
-                for k, v in self.request.headers.get_all():
-                    headers[k] = v
-
-                # Convert Tornado HTTPHeaders object to a regular dict
-                headers = {}
-                for k, v in self.request.headers.get_all():
-                    headers[k] = v
+                headers = dict(self.request.headers)
 
                 if "/api/requestgroups/" in self.request.uri:
                     header = {'Authorization': headers['Authorization']}
@@ -290,19 +305,18 @@ class TestRouteHandler(tornado.web.RequestHandler):
                         if len(self.request.body) > 0
                         else None
                     )
-                    requests.put(
+                    session.put(
                         url,
                         json=json_body,
                         headers=header,
                     )
                 else:
                     log(f"Forwarding PUT call: {url}")
-                    s = requests.Session()
                     req = requests.Request(
                         'PUT', url, data=self.request.body, headers=headers
                     )
                     prepped = req.prepare()
-                    s.send(prepped)
+                    session.send(prepped)
 
                 # Get recorded document and pass it back
                 response = cass.responses_of(
@@ -339,26 +353,23 @@ class TestRouteHandler(tornado.web.RequestHandler):
             if real_host is not None:
                 url = real_host + self.request.uri
 
-                # Convert Tornado HTTPHeaders object to a regular dict
-                headers = {}
-                for k, v in self.request.headers.get_all():
-                    # Multiple values for a header should be in a comma-separated list
-                    if k in headers:
-                        headers[k] += f",{v}"
+                # Convert Tornado HTTPHeaders object to a regular dict;
+                # multiple values for a header are already comma-separated
+                headers = dict(self.request.headers)
+
+                # Only forward the call if the cassette cannot already
+                # answer it
+                request = vcr.request.Request("GET", url, "", headers)
+                if not cass.can_play_response_for(request):
+                    if is_wsdl is not None:
+                        log(f"Forwarding WSDL call {url}")
+                        Client(url=url, headers=headers, cache=None)
                     else:
-                        headers[k] = str(v)
-
-                if is_wsdl is not None:
-                    log(f"Forwarding WSDL call {url}")
-                    Client(url=url, headers=headers, cache=None)
-                else:
-                    log(f"Forwarding GET call: {url}")
-                    requests.get(url, headers=headers)
+                        log(f"Forwarding GET call: {url}")
+                        session.get(url, headers=headers)
 
                 # Get recorded document and pass it back
-                response = cass.responses_of(
-                    vcr.request.Request("GET", url, "", headers)
-                )[0]
+                response = cass.responses_of(request)[0]
                 self.set_status(
                     response["status"]["code"], response["status"]["message"]
                 )
@@ -422,29 +433,29 @@ class TestRouteHandler(tornado.web.RequestHandler):
                     log(f"Forwarding POST call {url}")
 
                 # Convert Tornado HTTPHeaders object to a regular dict
-                headers = {}
-                for k, v in self.request.headers.get_all():
-                    headers[k] = v
-
-                if "/api/requestgroups/" in self.request.uri:
-                    header = {'Authorization': headers['Authorization']}
-                    json_body = (
-                        json.loads(self.request.body.decode())
-                        if len(self.request.body) > 0
-                        else None
-                    )
-                    requests.post(
-                        url,
-                        json=json_body,
-                        headers=header,
-                    )
-                else:
-                    requests.post(url, data=self.request.body, headers=headers)
+                headers = dict(self.request.headers)
+
+                # Only forward the call if the cassette cannot already
+                # answer it
+                request = vcr.request.Request("POST", url, self.request.body, headers)
+                if not cass.can_play_response_for(request):
+                    if "/api/requestgroups/" in self.request.uri:
+                        header = {'Authorization': headers['Authorization']}
+                        json_body = (
+                            json.loads(self.request.body.decode())
+                            if len(self.request.body) > 0
+                            else None
+                        )
+                        session.post(
+                            url,
+                            json=json_body,
+                            headers=header,
+                        )
+                    else:
+                        session.post(url, data=self.request.body, headers=headers)
 
                 # Get recorded document and pass it back
-                response = cass.responses_of(
-                    vcr.request.Request("POST", url, self.request.body, headers)
-                )[0]
+                response = cass.responses_of(request)[0]
                 self.set_status(
                     response["status"]["code"], response["status"]["message"]
                 )
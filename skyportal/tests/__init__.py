@@ -1,3 +1,4 @@
+import functools
 import os
 import urllib.parse
 import requests
@@ -8,6 +9,13 @@ from baselayer.app.env import load_env
 IS_CI_BUILD = "TRAVIS" in os.environ or "GITHUB_ACTIONS" in os.environ
 
 
+@functools.lru_cache(maxsize=1)
+def default_api_host():
+    """Local SkyPortal host to talk to, read from the configuration once."""
+    env, cfg = load_env()
+    return f'http://localhost:{cfg["ports.app"]}'
+
+
 def api(
     method, endpoint, data=None, params=None, host=None, token=None, raw_response=False
 ):
@@ -41,8 +49,7 @@ def api(
         Response JSON, if `raw_response` is False.
     """
     if host is None:
-        env, cfg = load_env()
-        host = f'http://localhost:{cfg["ports.app"]}'
+        host = default_api_host()
     url = urllib.parse.urljoin(host, f'/api/{endpoint}')
     headers = {'Authorization': f'token {token}'} if token else None
     response = requests.request(method, url, json=data, params=params, headers=headers)
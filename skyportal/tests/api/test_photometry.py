@@ -4,7 +4,8 @@ import numpy as np
 import sncosmo
 
 from baselayer.app.env import load_env
-from skyportal.models import DBSession, Token
+from skyportal.handlers.api.photometry import serialize, serialize_many
+from skyportal.models import DBSession, Instrument, Photometry, Token
 from skyportal.tests import api
 
 _, cfg = load_env()
@@ -2605,3 +2606,38 @@ def test_photometry_stream_patch_access(
     )
     assert status == 200
     assert data['status'] == 'success'
+
+
+def test_serialize_many_matches_serialize():
+    instrument = Instrument(name='ZTF')
+    points = [
+        # detections, without and with a packet limiting magnitude
+        Photometry(filter='ztfg', mjd=58000.0, flux=12.24, fluxerr=0.031),
+        Photometry(
+            filter='ztfr',
+            mjd=58001.0,
+            flux=5.6,
+            fluxerr=0.2,
+            original_user_data={'limiting_mag': 20.5, 'magsys': 'vega'},
+        ),
+        # non-detections, without and with a packet limiting magnitude
+        Photometry(filter='ztfi', mjd=58002.0, flux=np.nan, fluxerr=1.3),
+        Photometry(
+            filter='ztfg',
+            mjd=58003.0,
+            flux=np.nan,
+            fluxerr=0.8,
+            original_user_data={'limiting_mag': 21.2, 'magsys': 'ab'},
+        ),
+        # no magnitude for a negative flux, mag=-inf for an infinite one
+        Photometry(filter='ztfr', mjd=58004.0, flux=-3.0, fluxerr=0.5),
+        Photometry(filter='ztfi', mjd=58005.0, flux=np.inf, fluxerr=0.5),
+    ]
+    for point in points:
+        point.instrument = instrument
+
+    for magsys in ['ab', 'vega']:
+        for format in ['mag', 'flux']:
+            assert serialize_many(points, magsys, format) == [
+                serialize(point, magsys, format) for point in points
+            ]
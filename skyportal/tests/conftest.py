@@ -9,7 +9,6 @@ import astroplan
 import numpy as np
 import pytest
 
-from baselayer.app import models
 from baselayer.app.test_util import driver  # noqa: F401
 from skyportal.model_util import create_token, delete_token
 from skyportal.models import (
@@ -51,7 +50,6 @@ from skyportal.tests.fixtures import (
     UserNotificationFactory,
     ThumbnailFactory,
 )
-from skyportal.tests.fixtures import TMP_DIR  # noqa: F401
 from skyportal.models import Obj
 
 # Add a "test factory" User so that all factory-generated comments have a
@@ -72,6 +70,10 @@ if not DBSession.query(User).filter(User.username == "testuser-cesium-ml-org").s
     )
     DBSession.commit()
 
+# Site lookups are deterministic, so only do them once per test session
+KECK_OBSERVER = astroplan.Observer.at_site('Keck')
+PALOMAR_OBSERVER = astroplan.Observer.at_site('Palomar')
+
 
 def pytest_runtest_setup(item):
     # Print timestamp when running each test
@@ -175,6 +177,18 @@ def take_screenshot_and_page_source(webdriver, nodeid):
         f.write('\n'.join(list(reversed(revlines[iend : (istart + 1)]))))  # noqa: E203
 
 
+@pytest.fixture(scope="session")
+def roles():
+    # The default roles are created once by the app setup and never modified
+    # by the tests, so look them up once instead of in every user fixture
+    return {
+        role.id: role
+        for role in DBSession()
+        .query(Role)
+        .filter(Role.id.in_(["Full user", "View only", "Group admin", "Super admin"]))
+    }
+
+
 @pytest.fixture()
 def public_stream():
     stream = StreamFactory()
@@ -499,7 +513,7 @@ def hst():
 
 @pytest.fixture()
 def keck1_telescope():
-    observer = astroplan.Observer.at_site('Keck')
+    observer = KECK_OBSERVER
     telescope = TelescopeFactory(
         name=f'Keck I Telescope_{uuid.uuid4()}',
         nickname=f'Keck1_{uuid.uuid4()}',
@@ -545,7 +559,7 @@ def xinglong_216cm():
 
 @pytest.fixture()
 def p60_telescope():
-    observer = astroplan.Observer.at_site('Palomar')
+    observer = PALOMAR_OBSERVER
     telescope = TelescopeFactory(
         name=f'Palomar 60-inch telescope_{uuid.uuid4()}',
         nickname='p60_{uuid.uuid4()}',
@@ -646,10 +660,10 @@ def private_source():
 
 
 @pytest.fixture()
-def user(public_group, public_stream):
+def user(public_group, public_stream, roles):
     user = UserFactory(
         groups=[public_group],
-        roles=[models.Role.query.get("Full user")],
+        roles=[roles["Full user"]],
         streams=[public_stream],
     )
     user_id = user.id
@@ -658,10 +672,10 @@ def user(public_group, public_stream):
 
 
 @pytest.fixture()
-def user_stream2_only(public_group, public_stream2):
+def user_stream2_only(public_group, public_stream2, roles):
     user = UserFactory(
         groups=[public_group],
-        roles=[models.Role.query.get("Full user")],
+        roles=[roles["Full user"]],
         streams=[public_stream2],
     )
     user_id = user.id
@@ -670,10 +684,10 @@ def user_stream2_only(public_group, public_stream2):
 
 
 @pytest.fixture()
-def user_group2(public_group2, public_stream):
+def user_group2(public_group2, public_stream, roles):
     user = UserFactory(
         groups=[public_group2],
-        roles=[models.Role.query.get("Full user")],
+        roles=[roles["Full user"]],
         streams=[public_stream],
     )
     user_id = user.id
@@ -694,10 +708,10 @@ def public_groupuser(public_group, user):
 
 
 @pytest.fixture()
-def user2(public_group, public_stream):
+def user2(public_group, public_stream, roles):
     user = UserFactory(
         groups=[public_group],
-        roles=[models.Role.query.get("Full user")],
+        roles=[roles["Full user"]],
         streams=[public_stream],
     )
     user_id = user.id
@@ -706,19 +720,17 @@ def user2(public_group, public_stream):
 
 
 @pytest.fixture()
-def user_no_groups(public_stream):
-    user = UserFactory(
-        roles=[models.Role.query.get("Full user")], streams=[public_stream]
-    )
+def user_no_groups(public_stream, roles):
+    user = UserFactory(roles=[roles["Full user"]], streams=[public_stream])
     user_id = user.id
     yield user
     UserFactory.teardown(user_id)
 
 
 @pytest.fixture()
-def user_no_groups_two_streams(public_stream, public_stream2):
+def user_no_groups_two_streams(public_stream, public_stream2, roles):
     user = UserFactory(
-        roles=[models.Role.query.get("Full user")],
+        roles=[roles["Full user"]],
         streams=[public_stream, public_stream2],
     )
     user_id = user.id
@@ -727,74 +739,66 @@ def user_no_groups_two_streams(public_stream, public_stream2):
 
 
 @pytest.fixture()
-def user_no_groups_no_streams():
-    user = UserFactory(roles=[models.Role.query.get("Full user")], streams=[])
+def user_no_groups_no_streams(roles):
+    user = UserFactory(roles=[roles["Full user"]], streams=[])
     user_id = user.id
     yield user
     UserFactory.teardown(user_id)
 
 
 @pytest.fixture()
-def view_only_token_no_groups(user_no_groups):
-    token_id = create_token(ACLs=[], user_id=user_no_groups.id, name=str(uuid.uuid4()))
-    yield token_id
-    delete_token(token_id)
+def token_factory():
+    """
+    Create tokens for fixture users; every token made during a test is
+    deleted again when the test finishes.
+    """
+    token_ids = []
+
+    def make_token(user, ACLs):
+        token_id = create_token(ACLs=ACLs, user_id=user.id, name=str(uuid.uuid4()))
+        token_ids.append(token_id)
+        return token_id
+
+    yield make_token
+    for token_id in token_ids:
+        delete_token(token_id)
+
+
+@pytest.fixture()
+def view_only_token_no_groups(user_no_groups, token_factory):
+    return token_factory(user_no_groups, [])
 
 
 @pytest.fixture()
-def upload_data_token_stream2(user_stream2_only):
-    token_id = create_token(
-        ACLs=["Upload data"], user_id=user_stream2_only.id, name=str(uuid.uuid4())
-    )
-    yield token_id
-    delete_token(token_id)
+def upload_data_token_stream2(user_stream2_only, token_factory):
+    return token_factory(user_stream2_only, ["Upload data"])
 
 
 @pytest.fixture()
-def view_only_token_no_groups_no_streams(user_no_groups_no_streams):
-    token_id = create_token(
-        ACLs=[], user_id=user_no_groups_no_streams.id, name=str(uuid.uuid4())
-    )
-    yield token_id
-    delete_token(token_id)
+def view_only_token_no_groups_no_streams(user_no_groups_no_streams, token_factory):
+    return token_factory(user_no_groups_no_streams, [])
 
 
 @pytest.fixture()
-def upload_data_token_no_groups(user_no_groups):
-    token_id = create_token(
-        ACLs=["Upload data"], user_id=user_no_groups.id, name=str(uuid.uuid4())
-    )
-    yield token_id
-    delete_token(token_id)
+def upload_data_token_no_groups(user_no_groups, token_factory):
+    return token_factory(user_no_groups, ["Upload data"])
 
 
 @pytest.fixture()
-def upload_data_token_no_groups_two_streams(user_no_groups_two_streams):
-    token_id = create_token(
-        ACLs=["Upload data"],
-        user_id=user_no_groups_two_streams.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def upload_data_token_no_groups_two_streams(user_no_groups_two_streams, token_factory):
+    return token_factory(user_no_groups_two_streams, ["Upload data"])
 
 
 @pytest.fixture()
-def upload_data_token_no_groups_no_streams(user_no_groups_no_streams):
-    token_id = create_token(
-        ACLs=["Upload data"],
-        user_id=user_no_groups_no_streams.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def upload_data_token_no_groups_no_streams(user_no_groups_no_streams, token_factory):
+    return token_factory(user_no_groups_no_streams, ["Upload data"])
 
 
 @pytest.fixture()
-def user_two_groups(public_group, public_group2, public_stream):
+def user_two_groups(public_group, public_group2, public_stream, roles):
     user = UserFactory(
         groups=[public_group, public_group2],
-        roles=[models.Role.query.get("Full user")],
+        roles=[roles["Full user"]],
         streams=[public_stream],
     )
     user_id = user.id
@@ -803,10 +807,10 @@ def user_two_groups(public_group, public_group2, public_stream):
 
 
 @pytest.fixture()
-def view_only_user(public_group, public_stream):
+def view_only_user(public_group, public_stream, roles):
     user = UserFactory(
         groups=[public_group],
-        roles=[models.Role.query.get("View only")],
+        roles=[roles["View only"]],
         streams=[public_stream],
     )
     user_id = user.id
@@ -815,10 +819,10 @@ def view_only_user(public_group, public_stream):
 
 
 @pytest.fixture()
-def view_only_user2(public_group, public_stream):
+def view_only_user2(public_group, public_stream, roles):
     user = UserFactory(
         groups=[public_group],
-        roles=[models.Role.query.get("View only")],
+        roles=[roles["View only"]],
         streams=[public_stream],
     )
     user_id = user.id
@@ -827,10 +831,10 @@ def view_only_user2(public_group, public_stream):
 
 
 @pytest.fixture()
-def group_admin_user(public_group, public_stream):
+def group_admin_user(public_group, public_stream, roles):
     user = UserFactory(
         groups=[public_group],
-        roles=[models.Role.query.get("Group admin")],
+        roles=[roles["Group admin"]],
         streams=[public_stream],
     )
     user_id = user.id
@@ -847,10 +851,10 @@ def group_admin_user(public_group, public_stream):
 
 
 @pytest.fixture()
-def group_admin_user_two_groups(public_group, public_group2, public_stream):
+def group_admin_user_two_groups(public_group, public_group2, public_stream, roles):
     user = UserFactory(
         groups=[public_group, public_group2],
-        roles=[models.Role.query.get("Group admin")],
+        roles=[roles["Group admin"]],
         streams=[public_stream],
     )
     user_id = user.id
@@ -859,10 +863,10 @@ def group_admin_user_two_groups(public_group, public_group2, public_stream):
 
 
 @pytest.fixture()
-def super_admin_user(public_group, public_stream):
+def super_admin_user(public_group, public_stream, roles):
     user = UserFactory(
         groups=[public_group],
-        roles=[models.Role.query.get("Super admin")],
+        roles=[roles["Super admin"]],
         streams=[public_stream],
     )
     user_id = user.id
@@ -871,10 +875,10 @@ def super_admin_user(public_group, public_stream):
 
 
 @pytest.fixture()
-def super_admin_user_group2(public_group2, public_stream):
+def super_admin_user_group2(public_group2, public_stream, roles):
     user = UserFactory(
         groups=[public_group2],
-        roles=[models.Role.query.get("Super admin")],
+        roles=[roles["Super admin"]],
         streams=[public_stream],
     )
     user_id = user.id
@@ -883,10 +887,10 @@ def super_admin_user_group2(public_group2, public_stream):
 
 
 @pytest.fixture()
-def super_admin_user_two_groups(public_group, public_group2, public_stream):
+def super_admin_user_two_groups(public_group, public_group2, public_stream, roles):
     user = UserFactory(
         groups=[public_group, public_group2],
-        roles=[models.Role.query.get("Super admin")],
+        roles=[roles["Super admin"]],
         streams=[public_stream],
     )
     user_id = user.id
@@ -895,218 +899,120 @@ def super_admin_user_two_groups(public_group, public_group2, public_stream):
 
 
 @pytest.fixture()
-def view_only_token(user):
-    token_id = create_token(ACLs=[], user_id=user.id, name=str(uuid.uuid4()))
-    yield token_id
-    delete_token(token_id)
+def view_only_token(user, token_factory):
+    return token_factory(user, [])
 
 
 @pytest.fixture()
-def view_only_token2(user2):
-    token_id = create_token(ACLs=[], user_id=user2.id, name=str(uuid.uuid4()))
-    yield token_id
-    delete_token(token_id)
+def view_only_token2(user2, token_factory):
+    return token_factory(user2, [])
 
 
 @pytest.fixture()
-def view_only_token_group2(user_group2):
-    token_id = create_token(ACLs=[], user_id=user_group2.id, name=str(uuid.uuid4()))
-    yield token_id
-    delete_token(token_id)
+def view_only_token_group2(user_group2, token_factory):
+    return token_factory(user_group2, [])
 
 
 @pytest.fixture()
-def upload_data_token_group2(user_group2):
-    token_id = create_token(
-        ACLs=["Upload data"], user_id=user_group2.id, name=str(uuid.uuid4())
-    )
-    yield token_id
-    delete_token(token_id)
+def upload_data_token_group2(user_group2, token_factory):
+    return token_factory(user_group2, ["Upload data"])
 
 
 @pytest.fixture()
-def view_only_token_two_groups(user_two_groups):
-    token_id = create_token(ACLs=[], user_id=user_two_groups.id, name=str(uuid.uuid4()))
-    yield token_id
-    delete_token(token_id)
+def view_only_token_two_groups(user_two_groups, token_factory):
+    return token_factory(user_two_groups, [])
 
 
 @pytest.fixture()
-def manage_sources_token(group_admin_user):
-    token_id = create_token(
-        ACLs=["Manage sources"],
-        user_id=group_admin_user.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def manage_sources_token(group_admin_user, token_factory):
+    return token_factory(group_admin_user, ["Manage sources"])
 
 
 @pytest.fixture()
-def manage_sources_token_two_groups(group_admin_user_two_groups):
-    token_id = create_token(
-        ACLs=["Manage sources"],
-        user_id=group_admin_user_two_groups.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def manage_sources_token_two_groups(group_admin_user_two_groups, token_factory):
+    return token_factory(group_admin_user_two_groups, ["Manage sources"])
 
 
 @pytest.fixture()
-def upload_data_token(user):
-    token_id = create_token(
-        ACLs=["Upload data"], user_id=user.id, name=str(uuid.uuid4())
-    )
-    yield token_id
-    delete_token(token_id)
+def upload_data_token(user, token_factory):
+    return token_factory(user, ["Upload data"])
 
 
 @pytest.fixture()
-def upload_data_token_two_groups(user_two_groups):
-    token_id = create_token(
-        ACLs=["Upload data"],
-        user_id=user_two_groups.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def upload_data_token_two_groups(user_two_groups, token_factory):
+    return token_factory(user_two_groups, ["Upload data"])
 
 
 @pytest.fixture()
-def manage_groups_token(super_admin_user):
-    token_id = create_token(
-        ACLs=["Manage groups", "Upload data"],
-        user_id=super_admin_user.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def manage_groups_token(super_admin_user, token_factory):
+    return token_factory(super_admin_user, ["Manage groups", "Upload data"])
 
 
 @pytest.fixture()
-def group_admin_token(group_admin_user):
-    token_id = create_token(
-        ACLs=["Upload data"], user_id=group_admin_user.id, name=str(uuid.uuid4())
-    )
-    yield token_id
-    delete_token(token_id)
+def group_admin_token(group_admin_user, token_factory):
+    return token_factory(group_admin_user, ["Upload data"])
 
 
 @pytest.fixture()
-def manage_users_token(super_admin_user):
-    token_id = create_token(
-        ACLs=["Manage users", "Upload data"],
-        user_id=super_admin_user.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def manage_users_token(super_admin_user, token_factory):
+    return token_factory(super_admin_user, ["Manage users", "Upload data"])
 
 
 @pytest.fixture()
-def manage_users_token_group2(super_admin_user_group2):
-    token_id = create_token(
-        ACLs=["Manage users", "Upload data"],
-        user_id=super_admin_user_group2.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def manage_users_token_group2(super_admin_user_group2, token_factory):
+    return token_factory(super_admin_user_group2, ["Manage users", "Upload data"])
 
 
 @pytest.fixture()
-def super_admin_token(super_admin_user):
-    role = Role.query.get("Super admin")
-    token_id = create_token(
-        ACLs=[a.id for a in role.acls],
-        user_id=super_admin_user.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def super_admin_token(super_admin_user, roles, token_factory):
+    role = roles["Super admin"]
+    return token_factory(super_admin_user, [a.id for a in role.acls])
 
 
 @pytest.fixture()
-def super_admin_token_two_groups(super_admin_user_two_groups):
-    role = Role.query.get("Super admin")
-    token_id = create_token(
-        ACLs=[a.id for a in role.acls],
-        user_id=super_admin_user_two_groups.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def super_admin_token_two_groups(super_admin_user_two_groups, roles, token_factory):
+    role = roles["Super admin"]
+    return token_factory(super_admin_user_two_groups, [a.id for a in role.acls])
 
 
 @pytest.fixture()
-def comment_token(user):
-    token_id = create_token(ACLs=["Comment"], user_id=user.id, name=str(uuid.uuid4()))
-    yield token_id
-    delete_token(token_id)
+def comment_token(user, token_factory):
+    return token_factory(user, ["Comment"])
 
 
 @pytest.fixture()
-def annotation_token(user):
-    token_id = create_token(ACLs=["Annotate"], user_id=user.id, name=str(uuid.uuid4()))
-    yield token_id
-    delete_token(token_id)
+def annotation_token(user, token_factory):
+    return token_factory(user, ["Annotate"])
 
 
 @pytest.fixture()
-def classification_token(user):
-    token_id = create_token(ACLs=["Classify"], user_id=user.id, name=str(uuid.uuid4()))
-    yield token_id
-    delete_token(token_id)
+def classification_token(user, token_factory):
+    return token_factory(user, ["Classify"])
 
 
 @pytest.fixture()
-def classification_token_two_groups(user_two_groups):
-    token_id = create_token(
-        ACLs=["Classify"], user_id=user_two_groups.id, name=str(uuid.uuid4())
-    )
-    yield token_id
-    delete_token(token_id)
+def classification_token_two_groups(user_two_groups, token_factory):
+    return token_factory(user_two_groups, ["Classify"])
 
 
 @pytest.fixture()
-def taxonomy_token(user):
-    token_id = create_token(
-        ACLs=["Post taxonomy", "Delete taxonomy"],
-        user_id=user.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def taxonomy_token(user, token_factory):
+    return token_factory(user, ["Post taxonomy", "Delete taxonomy"])
 
 
 @pytest.fixture()
-def taxonomy_token_two_groups(user_two_groups):
-    token_id = create_token(
-        ACLs=["Post taxonomy", "Delete taxonomy"],
-        user_id=user_two_groups.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def taxonomy_token_two_groups(user_two_groups, token_factory):
+    return token_factory(user_two_groups, ["Post taxonomy", "Delete taxonomy"])
 
 
 @pytest.fixture()
-def comment_token_two_groups(user_two_groups):
-    token_id = create_token(
-        ACLs=["Comment"], user_id=user_two_groups.id, name=str(uuid.uuid4())
-    )
-    yield token_id
-    delete_token(token_id)
+def comment_token_two_groups(user_two_groups, token_factory):
+    return token_factory(user_two_groups, ["Comment"])
 
 
 @pytest.fixture()
-def annotation_token_two_groups(user_two_groups):
-    token_id = create_token(
-        ACLs=["Annotate"], user_id=user_two_groups.id, name=str(uuid.uuid4())
-    )
-    yield token_id
-    delete_token(token_id)
+def annotation_token_two_groups(user_two_groups, token_factory):
+    return token_factory(user_two_groups, ["Annotate"])
 
 
 @pytest.fixture()
@@ -1176,23 +1082,17 @@ def public_source_group2_followup_request(
 
 
 @pytest.fixture()
-def sedm_listener_token(sedm, group_admin_user):
-    token_id = create_token(
-        ACLs=[sedm.listener_class.get_acl_id()],
-        user_id=group_admin_user.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def sedm_listener_token(sedm, group_admin_user, token_factory):
+    return token_factory(group_admin_user, [sedm.listener_class.get_acl_id()])
 
 
 @pytest.fixture()
-def source_notification_user(public_group):
+def source_notification_user(public_group, roles):
     user = UserFactory(
         contact_email="test_email@gmail.com",
         contact_phone="+12345678910",
         groups=[public_group],
-        roles=[models.Role.query.get("Full user")],
+        roles=[roles["Full user"]],
         preferences={"allowEmailNotifications": True, "allowSMSNotifications": True},
     )
     user_id = user.id
@@ -1201,14 +1101,8 @@ def source_notification_user(public_group):
 
 
 @pytest.fixture()
-def source_notification_user_token(source_notification_user):
-    token_id = create_token(
-        ACLs=[],
-        user_id=source_notification_user.id,
-        name=str(uuid.uuid4()),
-    )
-    yield token_id
-    delete_token(token_id)
+def source_notification_user_token(source_notification_user, token_factory):
+    return token_factory(source_notification_user, [])
 
 
 @pytest.fixture()
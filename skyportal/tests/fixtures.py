@@ -4,11 +4,10 @@ import pathlib
 import random
 import uuid
 from itertools import cycle, islice
-from tempfile import mkdtemp
 
 import factory
 import numpy as np
-from sqlalchemy import inspect
+from sqlalchemy import insert, inspect
 from sqlalchemy.orm.exc import ObjectDeletedError
 
 from baselayer.app.config import load_config
@@ -19,6 +18,7 @@ from skyportal.models import (
     User,
     Group,
     Photometry,
+    GroupPhotometry,
     Spectrum,
     Stream,
     Instrument,
@@ -42,7 +42,6 @@ from skyportal.models import (
 
 import tdtax
 
-TMP_DIR = mkdtemp()
 env, cfg = load_env()
 
 print("Loading test configuration from _test_config.yaml")
@@ -239,8 +238,10 @@ class SpectrumFactory(factory.alchemy.SQLAlchemyModelFactory):
         model = Spectrum
 
     instrument = factory.SubFactory(InstrumentFactory)
-    wavelengths = np.sort(1000 * np.random.random(20))
-    fluxes = 1e-9 * np.random.random(len(wavelengths))
+    wavelengths = factory.LazyFunction(lambda: np.sort(1000 * np.random.random(20)))
+    fluxes = factory.LazyAttribute(
+        lambda o: 1e-9 * np.random.random(len(o.wavelengths))
+    )
     observed_at = datetime.datetime.now()
     owner_id = 1
 
@@ -375,36 +376,78 @@ class ObjFactory(factory.alchemy.SQLAlchemyModelFactory):
         # Save the generated instruments so they can be cleaned up later
         obj.instruments = instruments
         filters = ['ztfg', 'ztfr', 'ztfi']
-        for instrument, filter in islice(zip(cycle(instruments), cycle(filters)), 10):
-            np.random.seed()
-            phot1 = PhotometryFactory(
-                obj_id=obj.id,
-                instrument=instrument,
-                filter=filter,
-                groups=passed_groups,
-                origin=uuid.uuid4(),
+        photometry = []
+        thumbnails = []
+        # Draw the random values for all 20 photometry points at once: the
+        # mjd of each point of a pair, and the flux/fluxerr of the first
+        randoms = np.random.default_rng().random((10, 4))
+        mjds = (58000.0 + randoms[:, :2]).tolist()
+        fluxes = (20 + 10 * randoms[:, 2]).tolist()
+        fluxerrs = (2 * randoms[:, 3]).tolist()
+        for k, (instrument, filter) in enumerate(
+            islice(zip(cycle(instruments), cycle(filters)), 10)
+        ):
+            point = {
+                'obj_id': obj.id,
+                'instrument_id': instrument.id,
+                'filter': filter,
+                'owner_id': 1,
+            }
+            photometry.append(
+                {
+                    **point,
+                    'mjd': mjds[k][0],
+                    'flux': fluxes[k],
+                    'fluxerr': fluxerrs[k],
+                    'origin': str(uuid.uuid4()),
+                }
             )
-            DBSession().add(phot1)
-            DBSession().add(
-                PhotometryFactory(
-                    obj_id=obj.id,
-                    flux=99.0,
-                    fluxerr=99.0,
-                    instrument=instrument,
-                    filter=filter,
-                    groups=passed_groups,
-                    origin=uuid.uuid4(),
-                )
+            photometry.append(
+                {
+                    **point,
+                    'mjd': mjds[k][1],
+                    'flux': 99.0,
+                    'fluxerr': 99.0,
+                    'origin': str(uuid.uuid4()),
+                }
             )
 
-            DBSession().add(ThumbnailFactory(obj_id=obj.id, type="new"))
-            DBSession().add(ThumbnailFactory(obj_id=obj.id, type="ps1"))
-            DBSession().add(CommentFactory(obj_id=obj.id, groups=passed_groups))
-        DBSession().add(
-            SpectrumFactory(
-                obj_id=obj.id, instrument=instruments[0], groups=passed_groups
+            thumbnails.append({'obj_id': obj.id, 'type': 'new'})
+            thumbnails.append({'obj_id': obj.id, 'type': 'ps1'})
+
+        # Insert the photometry and its group memberships with Core rather
+        # than going through PhotometryFactory for each point
+        photometry_ids = (
+            DBSession()
+            .execute(insert(Photometry).values(photometry).returning(Photometry.id))
+            .scalars()
+            .all()
+        )
+        if passed_groups:
+            DBSession().execute(
+                insert(GroupPhotometry),
+                [
+                    {'group_id': group.id, 'photometr_id': photometry_id}
+                    for photometry_id in photometry_ids
+                    for group in passed_groups
+                ],
             )
+        DBSession().bulk_insert_mappings(Thumbnail, thumbnails)
+
+        # Create the users first, since UserFactory commits, and only build
+        # the comments and spectrum so they all go in with the commit below
+        authors = [UserFactory() for _ in range(10)]
+        spectrum = SpectrumFactory.build(
+            obj_id=obj.id, instrument=instruments[0], groups=passed_groups
         )
+        comments = [
+            CommentFactory.build(obj_id=obj.id, author=author) for author in authors
+        ]
+        # build() skips the groups hook, so set the comment groups directly
+        for comment in comments:
+            comment.groups = list(passed_groups)
+        DBSession().add(spectrum)
+        DBSession().add_all(comments)
         DBSession().commit()
 
     @staticmethod
@@ -5,6 +5,14 @@ from .. import api
 from tdtax import taxonomy, __version__
 from datetime import datetime, timezone
 
+# Taxonomy fields shared by every taxonomy posted in these tests
+tdtax_payload = {
+    'hierarchy': taxonomy,
+    'provenance': f"tdtax_{__version__}",
+    'version': __version__,
+    'isLatest': True,
+}
+
 
 @pytest.mark.flaky(reruns=2)
 def test_add_new_source_renders_on_group_sources_page(
@@ -74,11 +82,8 @@ def test_add_new_source_renders_on_group_sources_page(
         'taxonomy',
         data={
             'name': "test taxonomy" + str(uuid.uuid4()),
-            'hierarchy': taxonomy,
             'group_ids': [public_group.id, public_group2.id],
-            'provenance': f"tdtax_{__version__}",
-            'version': __version__,
-            'isLatest': True,
+            **tdtax_payload,
         },
         token=taxonomy_token_two_groups,
     )
@@ -295,11 +300,8 @@ def test_slider_classifications(
         'taxonomy',
         data={
             'name': test_taxonomy,
-            'hierarchy': taxonomy,
             'group_ids': [public_group.id],
-            'provenance': f"tdtax_{__version__}",
-            'version': __version__,
-            'isLatest': True,
+            **tdtax_payload,
         },
         token=taxonomy_token,
     )
@@ -1,41 +1,81 @@
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from selenium.webdriver.common.action_chains import ActionChains
 
 from skyportal.tests import api
 
 
-@pytest.mark.flaky(reruns=2)
-def test_news_feed(
-    driver, user, public_source, public_group, upload_data_token, comment_token
-):
+def post_source(obj_id, group, token):
+    return api(
+        'POST',
+        'sources',
+        data={
+            'id': obj_id,
+            'ra': 234.22,
+            'dec': -22.33,
+            'redshift': 3,
+            'transient': False,
+            'ra_dis': 2.3,
+            'group_ids': [group.id],
+        },
+        token=token,
+    )
+
+
+def post_comment(obj_id, text, token):
+    return api('POST', 'comment', data={'obj_id': obj_id, 'text': text}, token=token)
+
+
+def source_added_item_xpath(obj_id_base, i):
+    return f'//div[contains(@class, "NewsFeed__entryContent")][.//p[text()="New source saved"]][.//a[@href="/source/{obj_id_base}_{i}"]]'
+
+
+def comment_item_xpath(i):
+    return f'//p[contains(text(),"comment_text_{i}")]'
+
+
+def wait_for_all_xpaths(driver, xpaths):
+    """
+    Wait for all of `xpaths` to be present with a single combined XPath, so
+    that the page is polled once per interval instead of once per element.
+    """
+    driver.wait_for_xpath(f'//body[{" and ".join(f".{xpath}" for xpath in xpaths)}]')
+
+
+@pytest.fixture()
+def two_sources_with_comments(public_group, upload_data_token, comment_token):
+    """
+    Post two sources, `{obj_id_base}_0` and `{obj_id_base}_1`, each with one
+    comment `comment_text_{i}`, and return `obj_id_base`.
+    """
     obj_id_base = str(uuid.uuid4())
-    for i in range(2):
-        status, data = api(
-            'POST',
-            'sources',
-            data={
-                'id': f'{obj_id_base}_{i}',
-                'ra': 234.22,
-                'dec': -22.33,
-                'redshift': 3,
-                'transient': False,
-                'ra_dis': 2.3,
-                'group_ids': [public_group.id],
-            },
-            token=upload_data_token,
+    obj_ids = [f'{obj_id_base}_{i}' for i in range(2)]
+    # The two sources (and then the two comments) are independent of each
+    # other, so post them concurrently; the comments need their sources
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        responses = executor.map(
+            lambda obj_id: post_source(obj_id, public_group, upload_data_token),
+            obj_ids,
         )
-        assert status == 200
-        assert data['data']['id'] == f'{obj_id_base}_{i}'
-
-        status, data = api(
-            'POST',
-            'comment',
-            data={'obj_id': f'{obj_id_base}_{i}', 'text': f'comment_text_{i}'},
-            token=comment_token,
+        for obj_id, (status, data) in zip(obj_ids, responses):
+            assert status == 200
+            assert data['data']['id'] == obj_id
+
+        responses = executor.map(
+            lambda i: post_comment(obj_ids[i], f'comment_text_{i}', comment_token),
+            range(2),
         )
-        assert status == 200
+        for status, data in responses:
+            assert status == 200
 
+    return obj_id_base
+
+
+@pytest.mark.flaky(reruns=2)
+def test_news_feed(driver, user, public_source, two_sources_with_comments):
+    obj_id_base = two_sources_with_comments
     driver.get(f'/become_user/{user.id}')
     driver.get('/')
     driver.wait_for_xpath('//span[text()="a few seconds ago"]')
@@ -43,47 +83,16 @@ def test_news_feed(
     driver.click_xpath('//*[@id="newsFeedSettingsIcon"]')
     driver.click_xpath('//*[@data-testid="categories.includeCommentsFromBots"]')
     driver.click_xpath('//button[contains(., "Save")]')
-    for i in range(2):
-        # Source added item
-        driver.wait_for_xpath(
-            f'//div[contains(@class, "NewsFeed__entryContent")][.//p[text()="New source saved"]][.//a[@href="/source/{obj_id_base}_{i}"]]'
-        )
-
-        # Comment item
-        driver.wait_for_xpath(f'//p[contains(text(),"comment_text_{i}")]')
+    wait_for_all_xpaths(
+        driver,
+        [source_added_item_xpath(obj_id_base, i) for i in range(2)]
+        + [comment_item_xpath(i) for i in range(2)],
+    )
 
 
 @pytest.mark.flaky(reruns=2)
-def test_news_feed_prefs_widget(
-    driver, user, public_source, public_group, upload_data_token, comment_token
-):
-    obj_id_base = str(uuid.uuid4())
-    for i in range(2):
-        status, data = api(
-            'POST',
-            'sources',
-            data={
-                'id': f'{obj_id_base}_{i}',
-                'ra': 234.22,
-                'dec': -22.33,
-                'redshift': 3,
-                'transient': False,
-                'ra_dis': 2.3,
-                'group_ids': [public_group.id],
-            },
-            token=upload_data_token,
-        )
-        assert status == 200
-        assert data['data']['id'] == f'{obj_id_base}_{i}'
-
-        status, data = api(
-            'POST',
-            'comment',
-            data={'obj_id': f'{obj_id_base}_{i}', 'text': f'comment_text_{i}'},
-            token=comment_token,
-        )
-        assert status == 200
-
+def test_news_feed_prefs_widget(driver, user, public_source, two_sources_with_comments):
+    obj_id_base = two_sources_with_comments
     driver.get(f'/become_user/{user.id}')
     driver.get('/')
     # Default is to not show bot comments; enable for now
@@ -91,54 +100,47 @@ def test_news_feed_prefs_widget(
     driver.click_xpath('//*[@data-testid="categories.includeCommentsFromBots"]')
     driver.click_xpath('//button[contains(., "Save")]')
     driver.wait_for_xpath('//span[text()="a few seconds ago"]')
-    for i in range(2):
-        # Source added item
-        driver.wait_for_xpath(
-            f'//div[contains(@class, "NewsFeed__entryContent")][.//p[text()="New source saved"]][.//a[@href="/source/{obj_id_base}_{i}"]]'
-        )
-
-        # Comment item
-        driver.wait_for_xpath(f'//p[contains(text(),"comment_text_{i}")]')
+    wait_for_all_xpaths(
+        driver,
+        [source_added_item_xpath(obj_id_base, i) for i in range(2)]
+        + [comment_item_xpath(i) for i in range(2)],
+    )
 
     driver.click_xpath('//*[@id="newsFeedSettingsIcon"]')
     n_items_input = driver.wait_for_xpath('//*[@data-testid="numItems"]//input')
     n_items_input.clear()
     ActionChains(driver).click(n_items_input).send_keys("2").perform()
     driver.click_xpath('//button[contains(., "Save")]')
-    source_added_item_xpath = f'//div[contains(@class, "NewsFeed__entryContent")][.//p[text()="New source saved"]][.//a[@href="/source/{obj_id_base}_0"]]'
-    driver.wait_for_xpath_to_disappear(source_added_item_xpath)
+    first_source_added_item_xpath = source_added_item_xpath(obj_id_base, 0)
+    driver.wait_for_xpath_to_disappear(first_source_added_item_xpath)
 
     driver.click_xpath('//*[@id="newsFeedSettingsIcon"]')
     n_items_input = driver.wait_for_xpath('//*[@data-testid="numItems"]//input')
     n_items_input.clear()
     ActionChains(driver).send_keys_to_element(n_items_input, "4").perform()
     driver.click_xpath('//button[contains(., "Save")]')
-    driver.wait_for_xpath(source_added_item_xpath)
+    driver.wait_for_xpath(first_source_added_item_xpath)
 
     driver.click_xpath('//*[@id="newsFeedSettingsIcon"]')
     driver.click_xpath('//*[@data-testid="categories.sources"]')
     driver.click_xpath('//button[contains(., "Save")]')
     for i in range(2):
         # Source added item
-        driver.wait_for_xpath_to_disappear(
-            f'//div[contains(@class, "NewsFeed__entryContent")][.//p[text()="New source saved"]][.//a[@href="/source/{obj_id_base}_{i}"]]'
-        )
+        driver.wait_for_xpath_to_disappear(source_added_item_xpath(obj_id_base, i))
 
     driver.click_xpath('//*[@id="newsFeedSettingsIcon"]')
     driver.click_xpath('//*[@data-testid="categories.comments"]')
     driver.click_xpath('//button[contains(., "Save")]')
     for i in range(2):
         # Comment item
-        driver.wait_for_xpath_to_disappear(f'//p[contains(text(),"comment_text_{i}")]')
+        driver.wait_for_xpath_to_disappear(comment_item_xpath(i))
     driver.click_xpath('//*[@id="newsFeedSettingsIcon"]')
     driver.click_xpath('//*[@data-testid="categories.comments"]')
     driver.click_xpath('//button[contains(., "Save")]')
-    for i in range(2):
-        # Comment item
-        driver.wait_for_xpath(f'//p[contains(text(),"comment_text_{i}")]')
+    wait_for_all_xpaths(driver, [comment_item_xpath(i) for i in range(2)])
     driver.click_xpath('//*[@id="newsFeedSettingsIcon"]')
     driver.click_xpath('//*[@data-testid="categories.includeCommentsFromBots"]')
     driver.click_xpath('//button[contains(., "Save")]')
     for i in range(2):
         # Comment item
-        driver.wait_for_xpath_to_disappear(f'//p[contains(text(),"comment_text_{i}")]')
+        driver.wait_for_xpath_to_disappear(comment_item_xpath(i))
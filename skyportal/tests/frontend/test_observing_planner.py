@@ -2,7 +2,6 @@ import uuid
 import pytest
 from ...models import DBSession, ObservingRun
 from .. import api
-import time
 
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
@@ -24,7 +23,10 @@ def post_assignment(obj, run, priority, comment, token):
 
 @pytest.mark.flaky(reruns=2)
 def test_source_is_added_to_observing_run_via_frontend(
-    driver, super_admin_user, public_source, red_transients_run,
+    driver,
+    super_admin_user,
+    public_source,
+    red_transients_run,
 ):
     driver.get(f"/become_user/{super_admin_user.id}")
     driver.get(f"/source/{public_source.id}")
@@ -203,7 +205,8 @@ def test_add_run_to_observing_run_page(
     # lris
     driver.click_xpath(f'//li[@data-value="{lris.id}"]', scroll_parent=True)
 
-    time.sleep(1)
+    # wait for the instrument menu to close before opening the group menu
+    driver.wait_for_xpath_to_disappear(f'//li[@data-value="{lris.id}"]')
 
     # groups
     driver.click_xpath('//*[@id="root_group_id"]')
@@ -0,0 +1,34 @@
+from skyportal.models import Comment, DBSession, GroupPhotometry, Photometry, Spectrum
+from skyportal.tests.fixtures import ObjFactory
+
+
+def test_obj_factory_photometry_groups(public_group, public_group2):
+    obj = ObjFactory(groups=[public_group, public_group2])
+    group_ids = {public_group.id, public_group2.id}
+    try:
+        photometry = (
+            DBSession().query(Photometry).filter(Photometry.obj_id == obj.id).all()
+        )
+        assert len(photometry) == 20
+
+        group_photometry = (
+            DBSession()
+            .query(GroupPhotometry)
+            .filter(GroupPhotometry.photometr_id.in_([p.id for p in photometry]))
+            .all()
+        )
+        assert len(group_photometry) == 40
+        for point in photometry:
+            assert {g.id for g in point.groups} == group_ids
+
+        comments = DBSession().query(Comment).filter(Comment.obj_id == obj.id).all()
+        assert len(comments) == 10
+        assert len({c.author_id for c in comments}) == 10
+        for comment in comments:
+            assert {g.id for g in comment.groups} == group_ids
+
+        spectra = DBSession().query(Spectrum).filter(Spectrum.obj_id == obj.id).all()
+        assert len(spectra) == 1
+        assert {g.id for g in spectra[0].groups} == group_ids
+    finally:
+        ObjFactory.teardown(obj)
@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 
 import pytest
@@ -9,6 +10,7 @@ from requests.exceptions import HTTPError, Timeout, ConnectionError
 from skyportal.tests import api
 from skyportal.utils.offset import (
     get_nearby_offset_stars,
+    get_nearby_offset_stars_many,
     get_finding_chart,
     get_ztfref_url,
     _calculate_best_position_for_offset_stars,
@@ -232,6 +234,22 @@ def test_get_nearby_offset_stars():
         )
 
 
+@pytest.mark.flaky(reruns=2)
+def test_get_nearby_offset_stars_many():
+    how_many = 3
+    sources = [(123.0, 33.3, "testSource1"), (123.1, 33.2, "testSource2")]
+    rez = asyncio.run(
+        get_nearby_offset_stars_many(
+            sources, how_many=how_many, radius_degrees=3 / 60.0
+        )
+    )
+    assert len(rez) == len(sources)
+    for (_, _, name), source_rez in zip(sources, rez):
+        assert len(source_rez) == 5
+        assert len(source_rez[0]) == how_many + 1
+        assert source_rez[0][0]["name"] == name
+
+
 desi_url = (
     "http://legacysurvey.org/viewer/fits-cutout/"
     "?ra=123.0&dec=33.0&layer=dr8&pixscale=2.0&bands=r"
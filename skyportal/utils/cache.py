@@ -117,9 +117,15 @@ class Cache:
 
     def clean_cache(self):
         # Remove stale cache files
-        cached_files = [
-            (f.stat().st_mtime, f.absolute()) for f in self._cache_dir.glob('*')
-        ]
+        cached_files = []
+        with os.scandir(self._cache_dir) as entries:
+            for entry in entries:
+                try:
+                    mtime = entry.stat().st_mtime
+                except FileNotFoundError:
+                    # removed by another cache user since the listing
+                    continue
+                cached_files.append((mtime, os.path.abspath(entry.path)))
         cached_files = sorted(cached_files, key=lambda x: x[0], reverse=True)
 
         now = time.time()
@@ -137,4 +143,5 @@ class Cache:
             self._remove([filename for (mtime, filename) in oldest])
 
     def __len__(self):
-        return len(list(self._cache_dir.glob('*')))
+        with os.scandir(self._cache_dir) as entries:
+            return sum(1 for entry in entries)
@@ -5,6 +5,14 @@ from baselayer.log import make_log
 
 log = make_log('gitlog')
 
+timechars = '[0-9\\-:\\+]'
+timestamp_re = f'(?P<time>{timechars}+T{timechars}+)'
+sha_re = '(?P<sha>[0-9a-f]{7,12})'
+email_re = '(?P<email>\\S*@\\S*?)'
+pr_desc_re = '(?P<description>.*?)'
+pr_nr_re = '( \\(\\#(?P<pr_nr>[0-9]*)\\))?'
+log_re = re.compile(f'\\[{timestamp_re} {sha_re} {email_re}\\] {pr_desc_re}{pr_nr_re}$')
+
 
 def get_gitlog(
     cwd='.',
@@ -83,20 +91,12 @@ def parse_gitlog(gitlog):
     commit_url_base = gitlog['commit_url_base']
     name = gitlog.get('name', None)
 
-    timechars = '[0-9\\-:\\+]'
-    timestamp_re = f'(?P<time>{timechars}+T{timechars}+)'
-    sha_re = '(?P<sha>[0-9a-f]{7,12})'
-    email_re = '(?P<email>\\S*@\\S*?)'
-    pr_desc_re = '(?P<description>.*?)'
-    pr_nr_re = '( \\(\\#(?P<pr_nr>[0-9]*)\\))?'
-    log_re = f'\\[{timestamp_re} {sha_re} {email_re}\\] {pr_desc_re}{pr_nr_re}$'
-
     parsed_log = []
     for line in gitlog["log"]:
         if not line:
             continue
 
-        m = re.match(log_re, line)
+        m = log_re.match(line)
         if m is None:
             log(f'sysinfo: could not parse gitlog line: `{line}`')
             continue
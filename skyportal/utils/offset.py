@@ -1,6 +1,9 @@
 import io
 import os
+import asyncio
 import datetime
+import functools
+import threading
 import warnings
 from functools import wraps
 
@@ -198,6 +201,17 @@ starlist_formats = {
 JOBLIB_CACHE_SIZE = 100e6  # 100 MB
 offsets_memory = Memory("./cache/offsets/", verbose=0, bytes_limit=JOBLIB_CACHE_SIZE)
 
+# The ZTF reference catalog cache files are keyed by field/CCD/quadrant,
+# so nearby sources share them; the file cache has no locking of its own,
+# so keep one lock per catalog file
+ztfcatalog_locks = {}
+ztfcatalog_locks_lock = threading.Lock()
+
+
+def _ztfcatalog_lock(catname):
+    with ztfcatalog_locks_lock:
+        return ztfcatalog_locks.setdefault(catname, threading.Lock())
+
 
 def memcache(f):
     """Ensure that joblib memory cache stays within bytes limit."""
@@ -327,22 +341,26 @@ def get_ztfcatalog(ra, dec, cache_dir="./cache/finder_cat/", cache_max_items=100
     # the catalog data is in the same directory as the reference images
     caturl = refurl.replace("_refimg.fits", "_refpsfcat.fits")
     catname = os.path.basename(caturl)
-    hdu_fn = cache[catname]
 
-    if hdu_fn is not None:
-        with fits.open(hdu_fn) as hdu:
-            data = hdu[1].data
-    else:
-        response = get_url(caturl, stream=True, allow_redirects=True)
-        if response is None or response.status_code != 200:
-            return None
-        else:
-            with fits.open(io.BytesIO(response.content)) as hdu:
-                buf = io.BytesIO()
-                hdu.writeto(buf)
-                buf.seek(0)
-                cache[catname] = buf.read()
+    # sources in the same field/CCD/quadrant wait for each other here, so
+    # the catalog is only downloaded and written once
+    with _ztfcatalog_lock(catname):
+        hdu_fn = cache[catname]
+
+        if hdu_fn is not None:
+            with fits.open(hdu_fn) as hdu:
                 data = hdu[1].data
+        else:
+            response = get_url(caturl, stream=True, allow_redirects=True)
+            if response is None or response.status_code != 200:
+                return None
+            else:
+                with fits.open(io.BytesIO(response.content)) as hdu:
+                    buf = io.BytesIO()
+                    hdu.writeto(buf)
+                    buf.seek(0)
+                    cache[catname] = buf.read()
+                    data = hdu[1].data
 
     ztftable = Table(data)
     ztftable["ra"].unit = u.deg
@@ -567,6 +585,38 @@ def get_formatted_standards_list(
     return {"starlist_info": starlist, "success": True}
 
 
+# ADQL query for offset star candidates around a position. The
+# {{main_db}} placeholder is left in place to be filled by GaiaQuery.query
+offset_stars_query_template = """
+                  SELECT TOP {top_n} DISTANCE(
+                    POINT('ICRS', ra, dec),
+                    POINT('ICRS', {ra}, {dec})) AS
+                    dist, source_id, ra, dec, ref_epoch,
+                    phot_rp_mean_mag, pmra, pmdec, parallax
+                  FROM {{main_db}}.gaia_source
+                  WHERE 1=CONTAINS(
+                    POINT('ICRS', ra, dec),
+                    CIRCLE('ICRS', {ra}, {dec},
+                           {radius}))
+                  AND phot_rp_mean_mag < {mag_limit}
+                  AND phot_rp_mean_mag > {mag_min}
+                  AND parallax < 250
+                """
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_offset_stars_query(ra, dec, radius, mag_limit, mag_min, top_n):
+    """Returns the Gaia ADQL query text for offset star candidates"""
+    return offset_stars_query_template.format(
+        ra=ra,
+        dec=dec,
+        radius=radius,
+        mag_limit=mag_limit,
+        mag_min=mag_min,
+        top_n=top_n,
+    )
+
+
 @warningfilter(action="ignore", category=DeprecationWarning)
 @warningfilter(action="ignore", category=AstropyWarning)
 @memcache
@@ -659,21 +709,14 @@ def get_nearby_offset_stars(
     # and go fainter as well
     fainter_diff = 2.0  # mag
     search_multipler = 10
-    query_string = f"""
-                  SELECT TOP {how_many*search_multipler} DISTANCE(
-                    POINT('ICRS', ra, dec),
-                    POINT('ICRS', {source_ra}, {source_dec})) AS
-                    dist, source_id, ra, dec, ref_epoch,
-                    phot_rp_mean_mag, pmra, pmdec, parallax
-                  FROM {{main_db}}.gaia_source
-                  WHERE 1=CONTAINS(
-                    POINT('ICRS', ra, dec),
-                    CIRCLE('ICRS', {source_ra}, {source_dec},
-                           {radius_degrees}))
-                  AND phot_rp_mean_mag < {mag_limit + fainter_diff}
-                  AND phot_rp_mean_mag > {mag_min}
-                  AND parallax < 250
-                """
+    query_string = _build_offset_stars_query(
+        source_ra,
+        source_dec,
+        radius_degrees,
+        mag_limit + fainter_diff,
+        mag_min,
+        how_many * search_multipler,
+    )
 
     g = GaiaQuery()
     r = g.query(query_string)
@@ -683,6 +726,18 @@ def get_nearby_offset_stars(
 
     catalog = SkyCoord.guess_from_table(r)
 
+    # pull the columns out as plain arrays once rather than going through
+    # per-row Table lookups in the loop below (positions are copied since
+    # they may be replaced by the ZTF reference positions)
+    ra_arr = np.array(r["ra"], dtype=float)
+    dec_arr = np.array(r["dec"], dtype=float)
+    pmra_arr = np.asarray(r["pmra"])
+    pmdec_arr = np.asarray(r["pmdec"])
+    parallax_arr = np.asarray(r["parallax"])
+    mag_arr = np.asarray(r["phot_rp_mean_mag"])
+    dist_arr = np.asarray(r["dist"])
+    source_id_arr = np.asarray(r["source_id"])
+
     if use_ztfref:
         ztfcatalog = get_ztfcatalog(source_ra, source_dec)
         if ztfcatalog is None:
@@ -691,12 +746,9 @@ def get_nearby_offset_stars(
                 f' at position {source_ra} {source_dec}'
             )
         else:
-            if (
-                sum(
-                    center.separation(ztfcatalog)
-                    < required_ztfref_source_distance * u.arcsec
-                )
-                == 0
+            if not np.any(
+                center.separation(ztfcatalog)
+                < required_ztfref_source_distance * u.arcsec
             ):
                 ztfcatalog = None
                 log(
@@ -710,22 +762,22 @@ def get_nearby_offset_stars(
     # from another star
     min_sep = min_sep_arcsec * u.arcsec
     good_list = []
-    for source in r:
+    for j in range(len(r)):
         c = SkyCoord(
-            ra=source["ra"],
-            dec=source["dec"],
+            ra=ra_arr[j],
+            dec=dec_arr[j],
             unit=(u.degree, u.degree),
             pm_ra_cosdec=(
-                np.cos(source["dec"] * np.pi / 180.0) * source['pmra'] * u.mas / u.yr
+                np.cos(dec_arr[j] * np.pi / 180.0) * pmra_arr[j] * u.mas / u.yr
             ),
-            pm_dec=source["pmdec"] * u.mas / u.yr,
+            pm_dec=pmdec_arr[j] * u.mas / u.yr,
             frame='icrs',
-            distance=min(abs(1 / source["parallax"]), 10) * u.kpc,
+            distance=min(abs(1 / parallax_arr[j]), 10) * u.kpc,
             obstime=gaia_obstime,
         )
 
         d2d = c.separation(catalog)  # match it to the catalog
-        if sum(d2d < min_sep) == 1 and source["phot_rp_mean_mag"] <= mag_limit:
+        if np.count_nonzero(d2d < min_sep) == 1 and mag_arr[j] <= mag_limit:
             # this star is not near another star and is bright enough
 
             # if there's a close match to ZTF reference position then use
@@ -743,15 +795,15 @@ def get_nearby_offset_stars(
 
                     dra, ddec = cprime.spherical_offsets_to(center)
                     # use the RA, DEC from ZTF here
-                    source["ra"] = ztfcatalog[idx].ra.value
-                    source["dec"] = ztfcatalog[idx].dec.value
+                    ra_arr[j] = ztfcatalog[idx].ra.value
+                    dec_arr[j] = ztfcatalog[idx].dec.value
                     good_list.append(
                         (
-                            source["dist"],
+                            dist_arr[j],
                             cprime,
-                            source,
-                            dra.to(u.arcsec),
-                            ddec.to(u.arcsec),
+                            j,
+                            dra.to_value(u.arcsec),
+                            ddec.to_value(u.arcsec),
                         )
                     )
             else:
@@ -761,7 +813,13 @@ def get_nearby_offset_stars(
                 cprime = c.apply_space_motion(new_obstime=source_obstime)
                 dra, ddec = cprime.spherical_offsets_to(center)
                 good_list.append(
-                    (source["dist"], c, source, dra.to(u.arcsec), ddec.to(u.arcsec))
+                    (
+                        dist_arr[j],
+                        c,
+                        j,
+                        dra.to_value(u.arcsec),
+                        ddec.to_value(u.arcsec),
+                    )
                 )
 
     good_list.sort()
@@ -806,9 +864,10 @@ def get_nearby_offset_stars(
         abrev_basename = basename[3:maxname_size]
 
     space = " "
+    to_string_kwargs = dict(sep=sep, decimal=False, precision=2, alwayssign=True)
     star_list_format = (
         f"{basename:{space}<{maxname_size}} "
-        + f"{center.to_string('hmsdms', sep=sep, decimal=False, precision=2, alwayssign=True)[1:]}"
+        + f"{center.to_string('hmsdms', **to_string_kwargs)[1:]}"
         + f" 2000.0  {commentstr} source_name={source_name}"
     )
 
@@ -823,37 +882,49 @@ def get_nearby_offset_stars(
             }
         )
 
-    for i, (dist, c, source, dra, ddec) in enumerate(good_list[:how_many]):
-        dras = f"{dra.value:<0.03f}\" E" if dra > 0 else f"{abs(dra.value):<0.03f}\" W"
-        ddecs = (
-            f"{ddec.value:<0.03f}\" N" if ddec > 0 else f"{abs(ddec.value):<0.03f}\" S"
-        )
+    offset_stars = good_list[:how_many]
+    # format all offset star positions in a single vectorized call
+    coord_strs = []
+    if len(offset_stars) > 0:
+        coord_strs = SkyCoord(
+            ra=[c.ra.deg for _, c, _, _, _ in offset_stars],
+            dec=[c.dec.deg for _, c, _, _, _ in offset_stars],
+            unit=(u.degree, u.degree),
+            frame='icrs',
+        ).to_string('hmsdms', **to_string_kwargs)
+    name_fmt = f"{space}<{maxname_size}"
+    epoch_str = " 2000.0 "
+
+    # offsets are plain floats in arcsec (units stripped when building good_list)
+    for i, (dist, c, j, dra, ddec) in enumerate(offset_stars):
+        dras = f"{dra:<0.03f}\" E" if dra > 0 else f"{abs(dra):<0.03f}\" W"
+        ddecs = f"{ddec:<0.03f}\" N" if ddec > 0 else f"{abs(ddec):<0.03f}\" S"
 
         if giveoffsets:
-            offsets = f"raoffset={dra.value:<0.03f} decoffset={ddec.value:<0.03f}"
+            offsets = f"raoffset={dra:<0.03f} decoffset={ddec:<0.03f}"
         else:
             offsets = ""
 
         name = f"{abrev_basename}_o{i+1}"
 
         star_list_format = (
-            f"{name:{space}<{maxname_size}} "
-            + f"{c.to_string('hmsdms', sep=sep, decimal=False, precision=2, alwayssign=True)[1:]}"
-            + f" 2000.0 {offsets}"
-            + f" {commentstr} dist={3600*dist:<0.02f}\"; {source['phot_rp_mean_mag']:<0.02f} mag"
+            f"{name:{name_fmt}} "
+            + coord_strs[i][1:]
+            + f"{epoch_str}{offsets}"
+            + f" {commentstr} dist={3600*dist:<0.02f}\"; {mag_arr[j]:<0.02f} mag"
             + f"; {dras}, {ddecs} "
-            + f" ID={source['source_id']}"
+            + f" ID={source_id_arr[j]}"
         )
 
         star_list.append(
             {
                 "str": star_list_format,
-                "ra": float(source["ra"]),
-                "dec": float(source["dec"]),
+                "ra": float(ra_arr[j]),
+                "dec": float(dec_arr[j]),
                 "name": name,
                 "dras": dras,
                 "ddecs": ddecs,
-                "mag": float(source["phot_rp_mean_mag"]),
+                "mag": float(mag_arr[j]),
             }
         )
 
@@ -867,6 +938,49 @@ def get_nearby_offset_stars(
     )
 
 
+async def get_nearby_offset_stars_many(sources, **kwargs):
+    """Finds offset stars for several sources concurrently, so that the
+       total wall time is set by the slowest Gaia query rather than by
+       the sum of all of them
+
+    Parameters
+    ----------
+    sources : list of tuple
+        (ra, dec, name) of each source
+    **kwargs : dict
+        Other parameters passed to `get_nearby_offset_stars`
+
+    Returns
+    -------
+    list
+        The `get_nearby_offset_stars` result tuple for each source,
+        in the same order as `sources`
+    """
+    # identical sources would compute and write the same cache entries
+    # from different threads, so only query each distinct source once
+    sources = [tuple(source) for source in sources]
+    unique_sources = list(dict.fromkeys(sources))
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *[
+            loop.run_in_executor(
+                None,
+                functools.partial(
+                    get_nearby_offset_stars,
+                    source_ra,
+                    source_dec,
+                    source_name,
+                    **kwargs,
+                ),
+            )
+            for source_ra, source_dec, source_name in unique_sources
+        ]
+    )
+    results = dict(zip(unique_sources, results))
+    return [results[source] for source in sources]
+
+
 def fits_image(
     center_ra,
     center_dec,
@@ -165,14 +165,22 @@ if __name__ == "__main__":
 
     references = {'public_group_id': public_group_id}
 
+    csv_columns = {}
+
+    def read_csv_columns(filename):
+        # the same CSV file can be referenced by several objects; hand each
+        # one its own copy of the columns
+        if filename not in csv_columns:
+            csv_columns[filename] = pd.read_csv(filename).to_dict(orient='list')
+        return {k: list(v) for k, v in csv_columns[filename].items()}
+
     def inject_references(obj):
         if isinstance(obj, dict):
             if 'file' in obj:
                 filename = pjoin(src_path, obj['file'])
                 if filename.endswith('csv'):
-                    df = pd.read_csv(filename)
                     obj.pop('file')
-                    obj.update(df.to_dict(orient='list'))
+                    obj.update(read_csv_columns(filename))
                 elif filename.endswith('.png'):
                     return base64.b64encode(open(filename, 'rb').read())
                 elif filename.endswith('xml'):